@@ -0,0 +1,95 @@
+"""
+Benchmark: approximate (IVF) vs exact top-k search over a large resume pool.
+
+Builds a synthetic pool with topic structure, indexes it with AnnIndex and
+reports query latency for exact sparse search and ANN search together with
+recall@k of the ANN results against the exact ones.
+
+Usage:
+    python benchmarks/ann_recall.py [--size 20000] [--queries 50] [-k 10]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from common import load_dataset_texts
+
+from resume_analyser.ann import AnnIndex
+from resume_analyser.engine import (
+    sparse_cosine_scores,
+    top_k_scores,
+    vectorize_documents,
+)
+
+
+def topic_corpus(texts, size, n_topics=40, seed=0):
+    """
+    Generates ``size`` resumes drawn from ``n_topics`` word distributions.
+
+    Real resume pools cluster by role; sampling each synthetic resume mostly
+    from one topic's vocabulary reproduces that structure, which is what the
+    IVF clustering relies on.
+    """
+    rng = random.Random(seed)
+    words = sorted(set(" ".join(texts).lower().split()))
+    topics = [rng.sample(words, min(150, len(words))) + [f"topic{t}w{j}" for j in range(50)]
+              for t in range(n_topics)]
+    documents = []
+    for i in range(size):
+        topic = topics[i % n_topics]
+        body = rng.choices(topic, k=200) + rng.choices(words, k=40)
+        documents.append(" ".join(body))
+    return documents, topics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("-k", "--top-k", type=int, default=10)
+    parser.add_argument("--projection", choices=["svd", "random"], default="svd")
+    parser.add_argument("--n-probe", type=int, default=8)
+    parser.add_argument("--rerank-depth", type=int)
+    args = parser.parse_args()
+
+    documents, topics = topic_corpus(load_dataset_texts(), args.size)
+    vectorizer, vectors = vectorize_documents(documents)
+
+    start = time.perf_counter()
+    index = AnnIndex(vectorizer, projection=args.projection,
+                     n_probe=args.n_probe).fit(vectors)
+    print(f"{args.size} resumes, {vectors.shape[1]} terms, "
+          f"{len(index.centroids_)} clusters; "
+          f"index built in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(1)
+    queries = [" ".join(rng.choices(rng.choice(topics), k=40))
+               for _ in range(args.queries)]
+
+    exact_time = ann_time = 0.0
+    recalls = []
+    for query in queries:
+        start = time.perf_counter()
+        _, query_vector = vectorize_documents([query], vectorizer)
+        exact_ids, _ = top_k_scores(
+            sparse_cosine_scores(query_vector, vectors), args.top_k)
+        exact_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = index.search(query, args.top_k,
+                               rerank_depth=args.rerank_depth)
+        ann_ids = [result["id"] for result in results]
+        ann_time += time.perf_counter() - start
+
+        recalls.append(len(set(exact_ids) & set(ann_ids)) / args.top_k)
+
+    n = len(queries)
+    print(f"exact: {exact_time / n * 1000:7.2f} ms/query")
+    print(f"  ann: {ann_time / n * 1000:7.2f} ms/query "
+          f"(n_probe={args.n_probe}, {args.projection})")
+    print(f"recall@{args.top_k}: {np.mean(recalls):.3f}")
+
+
+if __name__ == "__main__":
+    main()
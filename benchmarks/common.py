@@ -0,0 +1,50 @@
+"""
+Shared helpers for the benchmark scripts: the sample dataset and synthetic
+scale-ups of it.
+"""
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from resume_analyser import extract_text_from_pdf  # noqa: E402
+
+DATASET_DIR = os.path.join(REPO_ROOT, "resume_dataset")
+
+JOB_DESCRIPTION = (
+    "We are hiring an Android developer with Kotlin and Java experience, "
+    "data analysis skills, SQL, Python, machine learning, leadership and "
+    "strong communication."
+)
+
+
+def load_dataset_texts():
+    """Extracts the text of every PDF in resume_dataset/."""
+    return [
+        extract_text_from_pdf(os.path.join(DATASET_DIR, name))
+        for name in sorted(os.listdir(DATASET_DIR))
+        if name.lower().endswith(".pdf")
+    ]
+
+
+def synthesize(texts, size, seed=0):
+    """
+    Scales the dataset up to ``size`` resumes.
+
+    Each synthetic resume samples words from the real ones and adds a few
+    unique tokens, so the vocabulary keeps growing with the corpus the way a
+    real pool of resumes does.
+    """
+    if size <= len(texts):
+        return texts[:size]
+    rng = random.Random(seed)
+    words = " ".join(texts).split() or JOB_DESCRIPTION.split()
+    resumes = list(texts)
+    for i in range(size - len(texts)):
+        body = rng.choices(words, k=300)
+        body += [f"term{i}x{j}" for j in range(20)]
+        resumes.append(" ".join(body))
+    return resumes
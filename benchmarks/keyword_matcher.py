@@ -0,0 +1,66 @@
+"""
+Micro-benchmark: compiled keyword matcher vs sequential substring checks.
+
+The baseline reproduces the previous generate_key_points, which lowercased
+and rescanned the whole resume once per rule. Both are run over the text of
+every PDF in ``resume_dataset/`` and checked to return the same suggestions.
+The compiled matcher and the video lookup are then timed with the rule set
+grown by synthetic rules, to show their cost stays flat.
+
+Usage:
+    python benchmarks/keyword_matcher.py [--repeat 200]
+"""
+import argparse
+import timeit
+
+from common import load_dataset_texts
+
+from resume_analyser import generate_key_points
+from resume_analyser.keywords import keyword_rules
+from resume_analyser.recommendations import recommend_videos
+from resume_analyser.rules import Rule, RuleSet, get_rules
+
+
+def sequential_key_points(resume_text):
+    """The previous implementation: one lower() and one scan per rule."""
+    key_points = set()
+    for phrase, suggestion in keyword_rules():
+        if phrase in resume_text.lower():
+            key_points.add(suggestion)
+    return list(key_points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    texts = [text for text in load_dataset_texts() if text.strip()]
+    for text in texts:
+        assert set(generate_key_points(text)) == set(sequential_key_points(text))
+
+    print(f"{len(texts)} resumes with text, {len(keyword_rules())} rules, "
+          f"{args.repeat} repetitions")
+    for label, func in [("sequential", sequential_key_points),
+                        ("compiled", generate_key_points)]:
+        seconds = timeit.timeit(
+            lambda: [func(text) for text in texts], number=args.repeat)
+        per_resume = seconds / (args.repeat * len(texts)) * 1e6
+        print(f"{label:>10}: {per_resume:8.1f} µs per resume")
+
+    base = list(get_rules().rules)
+    for extra in (0, 1000, 10000):
+        rules = RuleSet(base + [
+            Rule(f"synthetic-{i}", [f"synthetic phrase {i}"],
+                 f"Synthetic suggestion {i}.", [f"https://example.com/{i}"])
+            for i in range(extra)])
+        seconds = timeit.timeit(
+            lambda: [recommend_videos(text, rules=rules) for text in texts],
+            number=args.repeat)
+        per_resume = seconds / (args.repeat * len(texts)) * 1e6
+        print(f"{len(rules):>6} rules: {per_resume:8.1f} µs per resume "
+              f"(matching and video lookup)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measures near-duplicate detection on a pool with re-submitted resumes.
+
+Builds a synthetic pool in which a share of the resumes are copies of
+others with a few words edited, then reports how many copies MinHash/LSH
+finds, how many unrelated resumes it wrongly flags, and the time to
+vectorise and score the pool with and without dropping the copies first.
+
+Usage:
+    python benchmarks/near_duplicates.py --resumes 5000 --duplicate-share 0.3
+"""
+import argparse
+import random
+import sys
+import time
+
+from common import JOB_DESCRIPTION, load_dataset_texts, synthesize
+
+from resume_analyser.dedup import Deduplicator
+from resume_analyser.engine import rank_resumes
+
+
+def edited(text, rng, edits):
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = f"edit{rng.randrange(10 ** 6)}"
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--duplicate-share", type=float, default=0.3)
+    parser.add_argument("--edits", type=int, default=3,
+                        help="Words changed in each copy")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    n_copies = int(args.resumes * args.duplicate_share)
+    originals = synthesize(load_dataset_texts(), args.resumes - n_copies)
+    originals = [text for text in originals if text.split()]
+    pool = [(i, text) for i, text in enumerate(originals)]
+    pool += [(rng.randrange(len(originals)), None) for _ in range(n_copies)]
+    pool = [(source, text if text is not None
+             else edited(originals[source], rng, args.edits))
+            for source, text in pool]
+    rng.shuffle(pool)
+
+    start = time.perf_counter()
+    rank_resumes(JOB_DESCRIPTION, [text for _, text in pool])
+    full_seconds = time.perf_counter() - start
+
+    dedup = Deduplicator()
+    kept, found, wrong = [], 0, 0
+    for key, (source, text) in enumerate(pool):
+        original = dedup.check(key, text)
+        if original is None:
+            kept.append(text)
+        elif pool[original][0] == source:
+            found += 1
+        else:
+            wrong += 1
+    start = time.perf_counter()
+    rank_resumes(JOB_DESCRIPTION, kept)
+    dedup.processing_seconds = time.perf_counter() - start
+
+    actual = len(pool) - len({source for source, _ in pool})
+    stats = dedup.stats()
+    print(f"{len(pool)} resumes, {actual} near-duplicate copies "
+          f"({args.edits} words edited)")
+    print(f"found {found}/{actual}, wrongly flagged {wrong}, "
+          f"dedup ratio {stats['dedup_ratio']:.1%}")
+    print(f"  without dedup: {full_seconds:8.3f} s")
+    print(f"     with dedup: {stats['seconds'] + dedup.processing_seconds:8.3f} s "
+          f"({stats['seconds']:.3f} s deduplicating)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
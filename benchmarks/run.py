@@ -0,0 +1,200 @@
+"""
+Benchmark suite for the scoring pipeline.
+
+Times each stage of the pipeline (PDF extraction, TF-IDF vectorisation,
+similarity scoring and suggestion generation) over the PDFs in
+``resume_dataset/`` and synthetic scale-ups to 1k and 10k resumes. Results
+are written as JSON and can be compared against a saved baseline; the run
+fails when a stage got slower or hungrier than the baseline allows.
+
+Usage:
+    python benchmarks/run.py --out bench.json
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --compare benchmarks/baseline.json --tolerance 0.25
+
+Each stage is run once untimed first, so one-off costs such as importing
+scikit-learn are not reported as stage time even with ``--repeat 1``; it
+then reports the best wall time over ``--repeat`` runs, throughput in
+resumes per second, the peak memory allocated by the stage (tracemalloc)
+and the process peak RSS after it.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+from common import (
+    DATASET_DIR,
+    JOB_DESCRIPTION,
+    load_dataset_texts,
+    synthesize,
+)
+
+from resume_analyser.engine import (
+    extract_text_from_pdf,
+    generate_key_points,
+    list_resume_files,
+    sparse_cosine_scores,
+    top_k_scores,
+    vectorize_documents,
+)
+
+DEFAULT_SIZES = [14, 1000, 10000]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MiB."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def run_stage(func, repeat):
+    """
+    Runs a stage once to warm up, ``repeat`` times untraced for timing, then
+    once under tracemalloc for memory, since tracing slows allocations down.
+
+    Returns:
+        tuple: (result of the last run, best seconds, peak allocated MiB).
+    """
+    # Lazy imports and first-call caches are paid here, outside the timings
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak / (1024 * 1024)
+
+
+def record(results, stage, size, seconds, peak_alloc_mb):
+    results.append({
+        "stage": stage,
+        "size": size,
+        "seconds": round(seconds, 6),
+        "resumes_per_second": round(size / seconds, 2) if seconds else None,
+        "peak_alloc_mb": round(peak_alloc_mb, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    })
+    print(f"{stage:>12} {size:>7} {seconds:>10.4f}s "
+          f"{results[-1]['resumes_per_second'] or 0:>12.1f}/s "
+          f"{peak_alloc_mb:>9.1f} MiB", file=sys.stderr)
+
+
+def run_benchmarks(sizes, repeat):
+    results = []
+    print(f"{'stage':>12} {'resumes':>7} {'best':>11} {'throughput':>14} "
+          f"{'alloc':>13}", file=sys.stderr)
+
+    # Extraction only runs over the real PDFs; the synthetic resumes are
+    # generated as text.
+    paths = list_resume_files(DATASET_DIR)
+    _, seconds, peak = run_stage(
+        lambda: [extract_text_from_pdf(path, workers=1) for path in paths],
+        repeat)
+    record(results, "extraction", len(paths), seconds, peak)
+
+    texts = load_dataset_texts()
+    for size in sizes:
+        resumes = synthesize(texts, size)
+
+        (_, vectors), seconds, peak = run_stage(
+            lambda: vectorize_documents([JOB_DESCRIPTION] + resumes), repeat)
+        record(results, "vectorise", size, seconds, peak)
+
+        _, seconds, peak = run_stage(
+            lambda: top_k_scores(
+                sparse_cosine_scores(vectors[0], vectors[1:]), 10),
+            repeat)
+        record(results, "scoring", size, seconds, peak)
+
+        _, seconds, peak = run_stage(
+            lambda: [generate_key_points(text) for text in resumes], repeat)
+        record(results, "suggestions", size, seconds, peak)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance, min_seconds=0.005):
+    """
+    Compares a report against a baseline.
+
+    Timings below ``min_seconds`` are too noisy to compare and are skipped.
+
+    Returns:
+        list: Human-readable descriptions of the regressions found.
+    """
+    previous = {(entry["stage"], entry["size"]): entry
+                for entry in baseline["results"]}
+    regressions = []
+    for entry in report["results"]:
+        old = previous.get((entry["stage"], entry["size"]))
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_alloc_mb"):
+            limit = old[metric] * (1 + tolerance)
+            if metric == "seconds" and entry[metric] < min_seconds:
+                continue
+            if old[metric] and entry[metric] > limit:
+                regressions.append(
+                    f"{entry['stage']} @ {entry['size']}: {metric} "
+                    f"{entry[metric]} > {old[metric]} (+{tolerance:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--save-baseline", metavar="PATH",
+                        help="Save the report as the new baseline")
+    parser.add_argument("--compare", metavar="PATH",
+                        help="Baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown or memory growth (default: 0.25)")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="Ignore timings shorter than this (default: 0.005)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.repeat)
+    output = json.dumps(report, indent=2)
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(output + "\n")
+    if not args.out and not args.save_baseline:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            regressions = compare(report, json.load(handle), args.tolerance,
+                                  args.min_seconds)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against the baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Compares the scoring backends.
+
+Checks that the pure-NumPy backend gives the same scores as the
+scikit-learn one, both when the IDF weights are fitted on the documents and
+with a corpus model, and times single-resume scoring with each.
+
+Usage:
+    python benchmarks/scoring_backends.py --repeat 20
+"""
+import argparse
+import sys
+import time
+
+from common import JOB_DESCRIPTION, load_dataset_texts
+
+from resume_analyser.backends import BACKENDS, get_backend
+from resume_analyser.corpus_model import build_corpus_model
+from resume_analyser.engine import rank_resumes
+from resume_analyser.tfidf import IdfTable
+
+TOLERANCE = 1e-9
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = load_dataset_texts()
+    vectorizer = build_corpus_model(texts)
+    models = {"sklearn": vectorizer,
+              "numpy": IdfTable.from_vectorizer(vectorizer)}
+
+    worst = 0.0
+    for label, use_model in (("fitted", False), ("corpus model", True)):
+        expected = rank_resumes(JOB_DESCRIPTION, texts, backend="sklearn",
+                                model=models["sklearn"] if use_model else None)
+        actual = rank_resumes(JOB_DESCRIPTION, texts, backend="numpy",
+                              model=models["numpy"] if use_model else None)
+        diff = float(abs(expected - actual).max())
+        worst = max(worst, diff)
+        print(f"{label:>13}: max |sklearn - numpy| = {diff:.2e} "
+              f"over {len(texts)} resumes")
+
+    for name in sorted(BACKENDS):
+        backend = get_backend(name)
+        for label, model in (("fitted", None), ("corpus model", models[name])):
+            seconds = best_time(
+                lambda: rank_resumes(JOB_DESCRIPTION, texts[:1],
+                                     model=model, backend=backend),
+                args.repeat)
+            print(f"{name:>8} {label:>13}: {seconds * 1000:8.3f} ms per resume")
+
+    if worst > TOLERANCE:
+        print(f"Scores differ by more than {TOLERANCE}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
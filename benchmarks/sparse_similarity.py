@@ -0,0 +1,60 @@
+"""
+Memory and latency benchmark: dense vs sparse similarity in rank_resumes.
+
+Compares the old ``fit_transform(...).toarray()`` + ``cosine_similarity``
+path against the sparse dot product now used by ``rank_resumes``, over the
+PDFs in ``resume_dataset/`` and synthetic scale-ups of them.
+
+Usage:
+    python benchmarks/sparse_similarity.py [--sizes 14 1000 3000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from common import JOB_DESCRIPTION, load_dataset_texts, synthesize
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from resume_analyser import rank_resumes
+
+
+def dense_rank(job_description, resumes):
+    """The previous, densifying implementation of rank_resumes."""
+    vectors = TfidfVectorizer().fit_transform([job_description] + resumes).toarray()
+    return cosine_similarity([vectors[0]], vectors[1:]).flatten()
+
+
+def measure(func, *args, **kwargs):
+    """Runs ``func`` and returns (result, seconds, peak traced MiB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[14, 1000, 3000])
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    texts = load_dataset_texts()
+    print(f"{'resumes':>8} {'path':>10} {'seconds':>9} {'peak MiB':>9}")
+    for size in args.sizes:
+        resumes = synthesize(texts, size)
+        rows = [
+            ("dense", dense_rank, {}),
+            ("sparse", rank_resumes, {}),
+            (f"top-{args.top_k}", rank_resumes, {"top_k": args.top_k}),
+        ]
+        for label, func, kwargs in rows:
+            _, elapsed, peak = measure(func, JOB_DESCRIPTION, resumes, **kwargs)
+            print(f"{size:>8} {label:>10} {elapsed:>9.3f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Cold-start benchmark.
+
+Every measurement runs in a fresh Python process, since import costs are
+only paid once per process:
+
+* ``import``: importing the ``resume_analyser`` package.
+* ``first_render``: importing Streamlit and rendering the app's landing page
+  (with the background prewarm switched off), i.e. time-to-first-render.
+* ``first_score``: scoring one resume in a cold process, with and without a
+  foreground ``prewarm()`` beforehand, and with the pure-NumPy backend.
+
+Each line reports the best wall time over ``--repeat`` processes, the peak
+RSS of the process and which heavy modules it had loaded. The run fails if
+the landing page pulled in scikit-learn.
+
+Usage:
+    python benchmarks/startup.py --repeat 5 --out startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from common import JOB_DESCRIPTION, REPO_ROOT
+
+HEAVY_MODULES = ("numpy", "scipy", "sklearn", "pandas", "PyPDF2", "joblib")
+
+# Shared by the child processes: prints the measurement as one JSON line
+REPORT = """
+import json, resource, sys
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+print(json.dumps({"seconds": seconds, "peak_rss_mb": round(rss_mb, 1),
+                  "loaded": [m for m in HEAVY if m in sys.modules]}))
+"""
+
+SCENARIOS = {
+    "import": """
+import time
+start = time.perf_counter()
+import resume_analyser
+seconds = time.perf_counter() - start
+""",
+    "first_render": """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(APP_PATH, default_timeout=120)
+app.run()
+assert not app.exception, app.exception
+seconds = time.perf_counter() - start
+""",
+    "first_score": """
+import time
+from resume_analyser import rank_resumes
+start = time.perf_counter()
+rank_resumes(JOB_DESCRIPTION, [JOB_DESCRIPTION])
+seconds = time.perf_counter() - start
+""",
+    "first_score_numpy": """
+import time
+from resume_analyser import rank_resumes
+start = time.perf_counter()
+rank_resumes(JOB_DESCRIPTION, [JOB_DESCRIPTION], backend="numpy")
+seconds = time.perf_counter() - start
+""",
+    "first_score_prewarmed": """
+import time
+from resume_analyser import rank_resumes
+from resume_analyser.warmup import prewarm
+prewarm(load_model=False, background=False)
+start = time.perf_counter()
+rank_resumes(JOB_DESCRIPTION, [JOB_DESCRIPTION])
+seconds = time.perf_counter() - start
+""",
+}
+
+
+def run_scenario(name):
+    """
+    Runs one scenario in a fresh interpreter.
+
+    Returns:
+        dict: ``seconds``, ``peak_rss_mb`` and ``loaded`` heavy modules.
+    """
+    preamble = (f"HEAVY = {HEAVY_MODULES!r}\n"
+                f"APP_PATH = {os.path.join(REPO_ROOT, 'app.py')!r}\n"
+                f"JOB_DESCRIPTION = {JOB_DESCRIPTION!r}\n")
+    env = dict(os.environ, RESUME_ANALYSER_PREWARM="0",
+               PYTHONPATH=os.pathsep.join(
+                   filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run(
+        [sys.executable, "-c", preamble + SCENARIOS[name] + REPORT],
+        cwd=REPO_ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmarks(repeat):
+    results = []
+    print(f"{'scenario':>22} {'best':>10} {'rss':>10}  loaded", file=sys.stderr)
+    for name in SCENARIOS:
+        runs = [run_scenario(name) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run["seconds"])
+        results.append({
+            "scenario": name,
+            "seconds": round(best["seconds"], 4),
+            "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+            "loaded": best["loaded"],
+        })
+        print(f"{name:>22} {best['seconds']:>9.3f}s "
+              f"{results[-1]['peak_rss_mb']:>7.1f} MiB  "
+              f"{', '.join(best['loaded']) or '-'}", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Fresh processes per scenario (default: 3)")
+    parser.add_argument("--out", help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repeat)
+    output = json.dumps({"results": results}, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+    render = next(r for r in results if r["scenario"] == "first_render")
+    if "sklearn" in render["loaded"]:
+        print("The landing page imported scikit-learn.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Memory of streaming ingestion against a TfidfVectorizer fit.
+
+Feeds the same generator of synthetic resumes to ``TfidfVectorizer`` and to
+a ``StreamingStore`` and reports the peak memory allocated by each
+(tracemalloc). The vectorizer's vocabulary and matrix grow with the number
+of resumes; the store's footprint stays flat.
+
+Usage:
+    python benchmarks/streaming_memory.py --sizes 1000 10000 50000
+"""
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import load_dataset_texts
+
+from resume_analyser.streaming import StreamingStore
+
+
+def stream_resumes(texts, size, seed=0):
+    """Yields ``size`` synthetic resumes one at a time, like ``synthesize``."""
+    rng = random.Random(seed)
+    words = " ".join(texts).split()
+    for i in range(size):
+        body = rng.choices(words, k=300)
+        body += [f"term{i}x{j}" for j in range(20)]
+        yield " ".join(body)
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args()
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    texts = load_dataset_texts()
+    print(f"{'resumes':>8} {'method':>10} {'seconds':>9} {'peak MiB':>9}")
+    for size in args.sizes:
+        seconds, peak = measure(
+            lambda: TfidfVectorizer().fit_transform(stream_resumes(texts, size)))
+        print(f"{size:>8} {'tfidf':>10} {seconds:>9.2f} {peak:>9.1f}")
+
+        directory = tempfile.mkdtemp()
+        try:
+            store = StreamingStore(directory, chunk_size=args.chunk_size)
+            seconds, peak = measure(lambda: (
+                store.ingest_texts(stream_resumes(texts, size)),
+                store.finalize()))
+            print(f"{size:>8} {'streaming':>10} {seconds:>9.2f} {peak:>9.1f}")
+        finally:
+            shutil.rmtree(directory)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
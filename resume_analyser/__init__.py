@@ -0,0 +1,19 @@
+"""
+Smart Resume Analyser scoring package.
+"""
+from resume_analyser.engine import (
+    extract_text_from_pdf,
+    generate_key_points,
+    rank_resume_batch,
+    rank_resumes,
+)
+from resume_analyser.recommendations import recommend_videos, video_recommendations
+
+__all__ = [
+    "extract_text_from_pdf",
+    "generate_key_points",
+    "rank_resume_batch",
+    "rank_resumes",
+    "recommend_videos",
+    "video_recommendations",
+]
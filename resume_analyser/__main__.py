@@ -0,0 +1,5 @@
+import sys
+
+from resume_analyser.cli import main
+
+sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Approximate nearest-neighbour search for very large resume pools.
+
+The sparse TF-IDF vectors are projected into a dense, low-dimensional space
+(truncated SVD or sparse random projection) and grouped with k-means into an
+IVF (inverted file) index. A query is projected the same way and only the
+resumes in its ``n_probe`` nearest clusters are scored. The best of those
+candidates are then reranked with the exact sparse cosine similarity, so
+the returned scores are exact even though the candidate set is approximate.
+
+Layout of an index directory::
+
+    model.joblib        the vectorizer, the projection and the parameters
+    ivf.npz             projected vectors, centroids and inverted lists
+    vectors.npz         the exact TF-IDF rows used for reranking
+    documents.json      one metadata entry per resume, e.g. its file name
+"""
+import json
+import math
+import os
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.random_projection import SparseRandomProjection
+
+from resume_analyser.engine import (
+    extract_text_from_pdf,
+    list_resume_files,
+    sparse_cosine_scores,
+    top_k_scores,
+    vectorize_documents,
+)
+from resume_analyser.pdf_cache import file_digest
+
+PROJECTIONS = ("svd", "random")
+DOCUMENTS_FILE = "documents.json"
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class AnnIndex:
+    """
+    IVF index over projected TF-IDF vectors with exact reranking.
+
+    Args:
+        vectorizer (TfidfVectorizer): The fitted vectorizer used for the
+            resumes and queries, typically the corpus model.
+        n_components (int): Dimension of the projected space.
+        projection (str): ``"svd"`` for truncated SVD or ``"random"`` for a
+            sparse random projection.
+        n_clusters (int, optional): Number of IVF clusters. Defaults to
+            about the square root of the number of resumes.
+        n_probe (int): Number of clusters scanned per query.
+        random_state (int): Seed for the projection and clustering.
+    """
+
+    def __init__(self, vectorizer, n_components=128, projection="svd",
+                 n_clusters=None, n_probe=8, random_state=0):
+        if projection not in PROJECTIONS:
+            raise ValueError(f"projection must be one of {PROJECTIONS}")
+        self.vectorizer = vectorizer
+        self.n_components = n_components
+        self.projection = projection
+        self.n_clusters = n_clusters
+        self.n_probe = n_probe
+        self.random_state = random_state
+
+    def __len__(self):
+        return len(self.documents_)
+
+    def _project(self, vectors):
+        return _normalize_rows(
+            np.asarray(self.projector_.transform(vectors), dtype=np.float32))
+
+    def fit(self, resume_vectors, metadata=None):
+        """
+        Builds the index from the resumes' TF-IDF vectors.
+
+        Args:
+            resume_vectors (scipy.sparse matrix): N x V TF-IDF rows, as
+                produced by ``vectorizer``.
+            metadata (list, optional): One dict per row, e.g. ``file_name``
+                and ``digest``, returned with the search results.
+
+        Returns:
+            AnnIndex: The fitted index.
+        """
+        self.resume_vectors_ = sp.csr_matrix(resume_vectors)
+        n_resumes, n_terms = self.resume_vectors_.shape
+        if metadata is None:
+            metadata = [{}] * n_resumes
+        if len(metadata) != n_resumes:
+            raise ValueError("Expected one metadata entry per vector")
+        self.documents_ = [dict(meta, id=i) for i, meta in enumerate(metadata)]
+
+        if self.projection == "svd":
+            n_components = max(1, min(self.n_components, n_terms - 1,
+                                      n_resumes - 1))
+            self.projector_ = TruncatedSVD(
+                n_components=n_components, random_state=self.random_state)
+        else:
+            self.projector_ = SparseRandomProjection(
+                n_components=self.n_components, dense_output=True,
+                random_state=self.random_state)
+        self.projector_.fit(self.resume_vectors_)
+        self.embeddings_ = self._project(self.resume_vectors_)
+
+        n_clusters = self.n_clusters or max(1, int(math.sqrt(n_resumes)))
+        n_clusters = min(n_clusters, n_resumes)
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, n_init=3,
+                                 random_state=self.random_state)
+        labels = kmeans.fit_predict(self.embeddings_)
+        self.centroids_ = _normalize_rows(
+            kmeans.cluster_centers_.astype(np.float32))
+
+        # Inverted lists: resume ids grouped by cluster
+        order = np.argsort(labels, kind="stable")
+        boundaries = np.searchsorted(labels[order], np.arange(n_clusters + 1))
+        self.list_ids_ = order
+        self.list_offsets_ = boundaries
+        return self
+
+    def fit_texts(self, resume_texts, metadata=None):
+        """
+        Vectorises resume texts with ``vectorizer`` and builds the index.
+
+        Args:
+            resume_texts (list): The resume texts.
+            metadata (list, optional): One dict per resume.
+
+        Returns:
+            AnnIndex: The fitted index.
+        """
+        _, vectors = vectorize_documents(resume_texts, self.vectorizer)
+        return self.fit(vectors, metadata)
+
+    def candidates(self, query_vector, n_probe=None):
+        """
+        Returns the resume ids in the clusters nearest to a query.
+
+        Args:
+            query_vector (scipy.sparse matrix): A 1 x V TF-IDF row.
+            n_probe (int, optional): Clusters to scan; defaults to
+                ``self.n_probe``.
+
+        Returns:
+            tuple: ``(ids, approximate_scores)`` for the candidate resumes.
+        """
+        n_probe = min(n_probe or self.n_probe, len(self.centroids_))
+        query = self._project(query_vector)[0]
+        nearest = np.argpartition(-(self.centroids_ @ query), n_probe - 1)[:n_probe]
+        ids = np.concatenate([
+            self.list_ids_[self.list_offsets_[c]:self.list_offsets_[c + 1]]
+            for c in nearest
+        ])
+        return ids, self.embeddings_[ids] @ query
+
+    def search(self, job_description, top_k=10, n_probe=None, rerank_depth=None):
+        """
+        Finds approximately the top-k resumes for a job description.
+
+        Args:
+            job_description (str): The job description.
+            top_k (int): Number of results.
+            n_probe (int, optional): Clusters to scan.
+            rerank_depth (int, optional): How many of the best approximate
+                candidates are rescored exactly. Defaults to ``50 * top_k``;
+                the projection blurs fine differences between similar
+                resumes, so a deeper rerank buys recall cheaply.
+
+        Returns:
+            list: Document metadata dicts, with the resume's row as ``id``
+            and its exact cosine similarity as ``score``, best first.
+        """
+        _, query_vector = vectorize_documents(
+            [job_description], self.vectorizer)
+        ids, approximate = self.candidates(query_vector, n_probe)
+
+        depth = rerank_depth or 50 * top_k
+        shortlist, _ = top_k_scores(approximate, depth)
+        shortlist_ids = ids[shortlist]
+        exact = sparse_cosine_scores(
+            query_vector, self.resume_vectors_[shortlist_ids])
+        best, scores = top_k_scores(exact, top_k)
+        return [dict(self.documents_[i], score=float(score))
+                for i, score in zip(shortlist_ids[best], scores)]
+
+    def save(self, path):
+        """
+        Saves the index to a directory.
+
+        Args:
+            path (str): Target directory, created if missing.
+        """
+        os.makedirs(path, exist_ok=True)
+        np.savez(os.path.join(path, "ivf.npz"),
+                 embeddings=self.embeddings_, centroids=self.centroids_,
+                 list_ids=self.list_ids_, list_offsets=self.list_offsets_)
+        sp.save_npz(os.path.join(path, "vectors.npz"), self.resume_vectors_)
+        with open(os.path.join(path, DOCUMENTS_FILE), "w",
+                  encoding="utf-8") as handle:
+            json.dump(self.documents_, handle)
+        joblib.dump({"vectorizer": self.vectorizer,
+                     "projector": self.projector_,
+                     "params": {"n_components": self.n_components,
+                                "projection": self.projection,
+                                "n_clusters": self.n_clusters,
+                                "n_probe": self.n_probe,
+                                "random_state": self.random_state}},
+                    os.path.join(path, "model.joblib"))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads an index saved with ``save``.
+
+        Args:
+            path (str): The index directory.
+
+        Returns:
+            AnnIndex: The loaded index.
+        """
+        model = joblib.load(os.path.join(path, "model.joblib"))
+        index = cls(model["vectorizer"], **model["params"])
+        index.projector_ = model["projector"]
+        with np.load(os.path.join(path, "ivf.npz")) as arrays:
+            index.embeddings_ = arrays["embeddings"]
+            index.centroids_ = arrays["centroids"]
+            index.list_ids_ = arrays["list_ids"]
+            index.list_offsets_ = arrays["list_offsets"]
+        index.resume_vectors_ = sp.load_npz(os.path.join(path, "vectors.npz")).tocsr()
+        documents_path = os.path.join(path, DOCUMENTS_FILE)
+        if os.path.exists(documents_path):
+            with open(documents_path, encoding="utf-8") as handle:
+                index.documents_ = json.load(handle)
+        else:
+            # Saved without metadata; results only carry the row
+            index.documents_ = [{"id": i}
+                                for i in range(index.resume_vectors_.shape[0])]
+        return index
+
+
+def build_ann_index(path, resumes, model=None, cache=None, **params):
+    """
+    Extracts and vectorises PDF resumes, indexes them and saves the index.
+
+    Args:
+        path (str): The index directory.
+        resumes (str or list): A directory of PDF resumes, or a list of
+            paths or uploaded file objects.
+        model (TfidfVectorizer, optional): The corpus model to vectorise
+            with. Without one, a vectorizer is fitted on the resumes.
+        cache (TextCache, optional): Cache for the extracted text.
+        **params: ``AnnIndex`` parameters such as ``projection`` and
+            ``n_probe``.
+
+    Returns:
+        AnnIndex: The fitted index.
+    """
+    if isinstance(resumes, (str, os.PathLike)):
+        resumes = list_resume_files(resumes)
+
+    texts, metadata = [], []
+    for file in resumes:
+        texts.append(extract_text_from_pdf(file, cache))
+        name = getattr(file, "name", file)
+        metadata.append({"file_name": os.path.basename(str(name)),
+                         "digest": file_digest(file)})
+
+    vectorizer, vectors = vectorize_documents(texts, model)
+    index = AnnIndex(vectorizer, **params).fit(vectors, metadata)
+    index.save(path)
+    return index
@@ -0,0 +1,206 @@
+"""
+Headless HTTP scoring API.
+
+Exposes the scoring engine to machine clients such as an ATS without going
+through the Streamlit UI. Resumes can be sent as PDF uploads or as raw text
+in multipart form data; responses are JSON.
+
+Run with:
+    uvicorn resume_analyser.api:app --host 0.0.0.0 --port 8000 --workers 4
+
+The CPU-bound work runs in the server's thread pool, so the event loop keeps
+accepting requests while resumes are being parsed and scored; use several
+uvicorn workers to spread that work across cores. The scoring models and
+the PDF extraction workers are loaded at startup, so the first requests do
+not pay for them.
+
+Uploaded PDFs go through the same limits as uploads in the app (size, page
+count and a parse timeout; see ``resume_analyser.uploads``), and a PDF that
+breaks them or cannot be read is answered with HTTP 422.
+
+Per-stage latency metrics are served at ``/metrics`` in the Prometheus text
+format. Add ``?profile=cprofile`` (or ``?profile=pyinstrument``) to a
+scoring request to get a profile of that request in the response.
+"""
+import asyncio
+import io
+from contextlib import asynccontextmanager
+from typing import List
+
+from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from resume_analyser.backends import get_backend
+from resume_analyser.corpus_model import load_corpus_model
+from resume_analyser.dedup import Deduplicator
+from resume_analyser.engine import (
+    generate_key_points,
+    rank_resume_batch,
+    rank_resumes,
+)
+from resume_analyser.metrics import profile_call, registry
+from resume_analyser.pdf_cache import default_text_cache
+from resume_analyser.recommendations import recommend_videos
+from resume_analyser.uploads import UploadRejected, get_upload_extractor
+
+
+def _load_models():
+    get_backend().load_model()
+    load_corpus_model()
+    get_upload_extractor().processes.start()
+
+
+@asynccontextmanager
+async def _lifespan(app):
+    await run_in_threadpool(_load_models)
+    yield
+
+
+app = FastAPI(title="Smart Resume Analyser API", lifespan=_lifespan)
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+class _NamedBytesIO(io.BytesIO):
+    """In-memory upload that keeps its original file name."""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+async def _read_upload(upload, max_bytes):
+    # One byte past the limit is enough for the extractor to reject it
+    return _NamedBytesIO(await upload.read(max_bytes + 1),
+                         upload.filename or "resume.pdf")
+
+
+async def _extract_upload(upload):
+    """
+    Extracts an uploaded PDF within the upload limits.
+
+    Raises:
+        HTTPException: 422 if the PDF breaks a limit or cannot be read.
+    """
+    extractor = get_upload_extractor()
+    file = await _read_upload(upload, extractor.max_bytes)
+    try:
+        return file, await asyncio.wrap_future(extractor.submit(file))
+    except UploadRejected as error:
+        raise HTTPException(
+            status_code=422, detail=f"{file.name}: {error}") from None
+
+
+def _score_text(job_description, text):
+    backend = get_backend()
+    scores = rank_resumes(job_description, [text],
+                          model=backend.load_model(), backend=backend)
+    return {"score": float(scores[0])}
+
+
+def _rank_batch(job_description, files, top_n_terms, dedup):
+    return rank_resume_batch(job_description, files, top_n_terms,
+                             model=load_corpus_model(),
+                             cache=default_text_cache, dedup=dedup)
+
+
+def _suggest(text):
+    key_points = generate_key_points(text)
+    return {
+        "key_points": key_points,
+        "videos": [{"key_point": point, "url": url}
+                   for point, url in recommend_videos(text)],
+    }
+
+
+async def _run(profile, func, *args, **kwargs):
+    """
+    Runs CPU-bound work in the thread pool, or profiled when requested.
+
+    Profiled calls run in the event loop thread so the profiler sees them;
+    that blocks other requests, so it is meant for one-off debugging only.
+    """
+    if profile is None:
+        return await run_in_threadpool(func, *args, **kwargs), None
+    if profile not in PROFILERS:
+        raise HTTPException(
+            status_code=422, detail=f"profile must be one of {PROFILERS}")
+    try:
+        return profile_call(func, *args, profiler=profile, **kwargs)
+    except ImportError:
+        raise HTTPException(
+            status_code=422, detail=f"{profile} is not installed") from None
+
+
+async def _resume_text(resume, resume_text):
+    """
+    Returns the resume text from either a PDF upload or a raw text field.
+    """
+    if resume is not None:
+        _, text = await _extract_upload(resume)
+        return text
+    if resume_text:
+        return resume_text
+    raise HTTPException(
+        status_code=422, detail="Send either a 'resume' PDF or 'resume_text'.")
+
+
+def _with_profile(body, *reports):
+    reports = [report for report in reports if report]
+    if reports:
+        body["profile"] = "\n".join(reports)
+    return body
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-stage latency metrics in the Prometheus text format."""
+    return registry.render_prometheus()
+
+
+@app.post("/score")
+async def score(job_description: str = Form(...),
+                resume: UploadFile = File(None),
+                resume_text: str = Form(None),
+                profile: str = Query(None)):
+    """Scores one resume against a job description."""
+    text = await _resume_text(resume, resume_text)
+    body, report = await _run(profile, _score_text, job_description, text)
+    return _with_profile(body, report)
+
+
+@app.post("/batch-score")
+async def batch_score(job_description: str = Form(...),
+                      resumes: List[UploadFile] = File(...),
+                      top_n_terms: int = Form(5),
+                      dedup: bool = Form(False),
+                      profile: str = Query(None)):
+    """Ranks several PDF resumes against a job description."""
+    extracted = await asyncio.gather(
+        *(_extract_upload(upload) for upload in resumes))
+    # The extractor cached the text, so ranking does not parse them again
+    files = [file for file, _ in extracted]
+    deduplicator = Deduplicator() if dedup else None
+    leaderboard, report = await _run(
+        profile, _rank_batch, job_description, files, top_n_terms,
+        deduplicator)
+    body = {"results": leaderboard}
+    if deduplicator is not None:
+        body["dedup"] = deduplicator.stats()
+    return _with_profile(body, report)
+
+
+@app.post("/suggestions")
+async def suggestions(resume: UploadFile = File(None),
+                      resume_text: str = Form(None),
+                      profile: str = Query(None)):
+    """Returns improvement suggestions and related videos for a resume."""
+    text = await _resume_text(resume, resume_text)
+    body, report = await _run(profile, _suggest, text)
+    return _with_profile(body, report)
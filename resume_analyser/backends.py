@@ -0,0 +1,287 @@
+"""
+Pluggable scoring backends.
+
+``rank_resumes`` delegates the TF-IDF vectorisation and cosine similarity to
+a backend:
+
+* ``sklearn`` (default): scikit-learn's ``TfidfVectorizer`` and SciPy sparse
+  matrices, with the joblib corpus model.
+* ``numpy``: the pure-NumPy engine in ``resume_analyser.tfidf``, with the
+  corpus model's IDF table. It never imports scikit-learn or SciPy, for
+  small-footprint workers that only score a handful of documents at a time.
+
+Both produce the same scores, and both can explain them: ``explain`` also
+returns each resume's top contributing terms and the job description terms
+it lacks, read from the same TF-IDF weights the scores come from. Choose
+one per call with
+``rank_resumes(..., backend="numpy")`` or per process with the
+``RESUME_ANALYSER_BACKEND`` environment variable.
+"""
+import functools
+import os
+
+DEFAULT_BACKEND = os.environ.get("RESUME_ANALYSER_BACKEND", "sklearn")
+
+
+class ScoringBackend:
+    """
+    Interface of a scoring backend.
+
+    Attributes:
+        name (str): The name the backend is registered under.
+        modules (tuple): The modules the backend imports on first use, for
+            ``resume_analyser.warmup``.
+    """
+
+    name = None
+    modules = ()
+
+    def load_model(self, path=None):
+        """
+        Loads the backend's form of the pre-fitted corpus model.
+
+        Args:
+            path (str, optional): The corpus model file; defaults to
+                ``corpus_model.DEFAULT_MODEL_PATH``.
+
+        Returns:
+            object: The model to pass to ``score``, or None if it has not
+            been built.
+        """
+        raise NotImplementedError
+
+    def score(self, job_description, resumes, model=None, info=None):
+        """
+        Computes the cosine similarity of each resume to a job description.
+
+        Args:
+            job_description (str): The job description.
+            resumes (list): The resume texts.
+            model (object, optional): A model from ``load_model``. Without
+                one, the IDF weights are fitted on the documents themselves.
+            info (dict, optional): Stage details to record the vocabulary
+                size in.
+
+        Returns:
+            numpy.ndarray: The cosine similarity of each resume.
+        """
+        raise NotImplementedError
+
+    def explain(self, job_description, resumes, model=None, info=None,
+                n_terms=5):
+        """
+        Scores resumes like ``score`` and explains each score.
+
+        Args:
+            job_description (str): The job description.
+            resumes (list): The resume texts.
+            model (object, optional): A model from ``load_model``.
+            info (dict, optional): Stage details to record the vocabulary
+                size in.
+            n_terms (int): How many terms to report of each kind.
+
+        Returns:
+            tuple: ``(scores, explanations)``; the cosine similarity of each
+            resume, and one dict per resume with ``matched_terms``, the
+            ``(term, contribution)`` pairs that add most to its score, and
+            ``missing_terms``, the ``(term, weight)`` pairs of the heaviest
+            job description terms it does not contain. Job description
+            terms the model has no weight for are missing terms too, listed
+            last with weight 0.
+        """
+        raise NotImplementedError
+
+
+def explain_terms(job_terms, job_weights, resume_weights, n_terms,
+                  unscored_terms=()):
+    """
+    Breaks a cosine score down into per-term contributions.
+
+    Args:
+        job_terms (dict): Term position -> term, for the job description.
+        job_weights (dict): Term position -> weight in the job description.
+        resume_weights (dict): Term position -> weight in the resume.
+        n_terms (int): How many terms to report of each kind.
+        unscored_terms (iterable): Job description terms outside the model's
+            vocabulary that the resume lacks; they add nothing to the score
+            but are still missing, so they are listed with weight 0.
+
+    Returns:
+        dict: ``matched_terms`` and ``missing_terms``; see
+        ``ScoringBackend.explain``.
+    """
+    matched, missing = [], []
+    for position, weight in job_weights.items():
+        resume_weight = resume_weights.get(position)
+        if resume_weight:
+            matched.append((job_terms[position], weight * resume_weight))
+        else:
+            missing.append((job_terms[position], weight))
+    missing.extend((term, 0.0) for term in unscored_terms)
+    matched.sort(key=lambda item: (-item[1], item[0]))
+    missing.sort(key=lambda item: (-item[1], item[0]))
+    return {"matched_terms": matched[:n_terms],
+            "missing_terms": missing[:n_terms]}
+
+
+class SklearnBackend(ScoringBackend):
+    """Scores with scikit-learn's ``TfidfVectorizer``."""
+
+    name = "sklearn"
+    modules = ("sklearn.feature_extraction.text", "scipy.sparse", "numpy",
+               "joblib")
+
+    def load_model(self, path=None):
+        from resume_analyser.corpus_model import load_corpus_model
+
+        return load_corpus_model(path)
+
+    def score(self, job_description, resumes, model=None, info=None):
+        from resume_analyser.engine import (
+            sparse_cosine_scores,
+            vectorize_documents,
+        )
+
+        _, vectors = vectorize_documents([job_description] + resumes, model)
+        if info is not None:
+            info["vocabulary_size"] = vectors.shape[1]
+        return sparse_cosine_scores(vectors[0], vectors[1:])
+
+    def explain(self, job_description, resumes, model=None, info=None,
+                n_terms=5):
+        from resume_analyser.engine import (
+            sparse_cosine_scores,
+            vectorize_documents,
+        )
+
+        vectorizer, vectors = vectorize_documents([job_description] + resumes,
+                                                  model)
+        if info is not None:
+            info["vocabulary_size"] = vectors.shape[1]
+        job_vector, resume_vectors = vectors[0], vectors[1:].tocsr()
+        scores = sparse_cosine_scores(job_vector, resume_vectors)
+
+        # Only job description terms can contribute, so only their names are
+        # looked up, rather than the whole vocabulary's
+        vocabulary = vectorizer.vocabulary_
+        job_terms = {vocabulary[term]: term
+                     for term in vectorizer.build_analyzer()(job_description)
+                     if term in vocabulary}
+        job_weights = dict(zip(job_vector.indices.tolist(),
+                               job_vector.data.tolist()))
+        # Terms outside a corpus model's vocabulary get no weight, but the
+        # resumes that lack them still miss them
+        analyzer = vectorizer.build_analyzer()
+        unscored = {term for term in analyzer(job_description)
+                    if term not in vocabulary}
+        indptr = resume_vectors.indptr
+        explanations = [
+            explain_terms(job_terms, job_weights,
+                         dict(zip(resume_vectors.indices[start:end].tolist(),
+                                  resume_vectors.data[start:end].tolist())),
+                         n_terms,
+                         unscored - set(analyzer(resume)) if unscored else ())
+            for resume, start, end in zip(resumes, indptr[:-1], indptr[1:])
+        ]
+        return scores, explanations
+
+
+@functools.lru_cache(maxsize=4)
+def _table_from_vectorizer(vectorizer):
+    from resume_analyser.tfidf import IdfTable
+
+    return IdfTable.from_vectorizer(vectorizer)
+
+
+def as_idf_table(model):
+    """
+    Returns a corpus model in the form the NumPy engine uses.
+
+    Args:
+        model (IdfTable or TfidfVectorizer): The model, or None.
+
+    Returns:
+        IdfTable: The model itself, or its IDF table (converted once per
+        vectorizer); None if ``model`` is None.
+    """
+    from resume_analyser.tfidf import IdfTable
+
+    if model is None or isinstance(model, IdfTable):
+        return model
+    return _table_from_vectorizer(model)
+
+
+class NumpyBackend(ScoringBackend):
+    """Scores with the pure-NumPy engine in ``resume_analyser.tfidf``."""
+
+    name = "numpy"
+    modules = ("numpy",)
+
+    def load_model(self, path=None):
+        from resume_analyser.corpus_model import load_idf_table
+
+        return load_idf_table(path)
+
+    def score(self, job_description, resumes, model=None, info=None):
+        from resume_analyser.tfidf import cosine_scores
+
+        # A fitted TfidfVectorizer is accepted too, and converted once
+        scores, table = cosine_scores(job_description, resumes,
+                                      as_idf_table(model))
+        if info is not None:
+            info["vocabulary_size"] = len(table)
+        return scores
+
+    def explain(self, job_description, resumes, model=None, info=None,
+                n_terms=5):
+        import numpy as np
+
+        from resume_analyser.tfidf import (
+            document_vectors,
+            sparse_dot,
+            term_names,
+            token_counts,
+            unscored_terms,
+        )
+
+        query, vectors, table = document_vectors(job_description, resumes,
+                                                 as_idf_table(model))
+        if info is not None:
+            info["vocabulary_size"] = len(table)
+
+        job_terms = term_names(job_description, query[0], table)
+        job_weights = dict(zip(query[0].tolist(), query[1].tolist()))
+        unscored = unscored_terms(job_description, table)
+        scores, explanations = [], []
+        for resume, vector in zip(resumes, vectors):
+            scores.append(sparse_dot(query, vector))
+            counts = token_counts(resume) if unscored else {}
+            explanations.append(explain_terms(
+                job_terms, job_weights,
+                dict(zip(vector[0].tolist(), vector[1].tolist())), n_terms,
+                [term for i, term in unscored.items() if i not in counts]))
+        return np.array(scores), explanations
+
+
+BACKENDS = {backend.name: backend for backend in (SklearnBackend, NumpyBackend)}
+
+
+def get_backend(backend=None):
+    """
+    Looks up a scoring backend.
+
+    Args:
+        backend (str or ScoringBackend, optional): A backend name, or a
+            backend instance, which is returned as is. Defaults to
+            ``RESUME_ANALYSER_BACKEND`` or ``"sklearn"``.
+
+    Returns:
+        ScoringBackend: The backend.
+    """
+    if isinstance(backend, ScoringBackend):
+        return backend
+    name = backend or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown scoring backend {name!r}; "
+                         f"choose one of {sorted(BACKENDS)}")
+    return BACKENDS[name]()
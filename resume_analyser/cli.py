@@ -0,0 +1,470 @@
+"""
+Command-line interface for bulk resume screening.
+
+Usage:
+    python -m resume_analyser score --jd jd.txt --resumes resume_dataset/ -j 8 --out results.jsonl
+    python -m resume_analyser build-model resume_dataset/
+    python -m resume_analyser index-add --index resume_index/ resume_dataset/
+    python -m resume_analyser search --index resume_index/ --jd jd.txt -k 10
+    python -m resume_analyser ann-build --ann resume_ann/ resume_dataset/
+    python -m resume_analyser search --ann resume_ann/ --jd jd.txt -k 10
+    python -m resume_analyser match --jds jobs/ --resumes resume_dataset/ -k 5
+
+``score`` extracts and scores resumes in parallel across processes and
+writes one JSONL or CSV record per resume as soon as it is ready, so the
+output can be piped into other tools while the run is still going.
+
+The index, store and matching modules import scikit-learn and SciPy, so
+they are imported by the subcommands that use them; ``score --backend
+numpy`` runs without either.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from resume_analyser.backends import BACKENDS, DEFAULT_BACKEND, get_backend
+from resume_analyser.corpus_model import (
+    DEFAULT_MODEL_PATH,
+    build_corpus_model,
+    load_corpus_model,
+    save_corpus_model,
+)
+from resume_analyser.dedup import DEFAULT_THRESHOLD, SIGNATURES_FILE, Deduplicator
+from resume_analyser.engine import (
+    extract_text_from_pdf,
+    generate_key_points,
+    list_resume_files,
+    rank_resumes,
+)
+from resume_analyser.rules import RULES_PATH, RuleError, load_rules
+
+CSV_FIELDS = ["file_name", "score", "key_points", "error"]
+
+
+def score_resume(job_description, path, model_path=None, backend=None):
+    """
+    Extracts, scores and analyses one resume; runs in a worker process.
+
+    Args:
+        job_description (str): The job description.
+        path (str): Path to the PDF resume.
+        model_path (str, optional): A saved corpus model. Without one, the
+            vectorizer is fitted on the job description and this resume.
+        backend (str, optional): The scoring backend name.
+
+    Returns:
+        dict: ``file_name``, ``score``, ``key_points`` and ``error`` for the
+        resume. Failures are reported in ``error`` instead of raised, so one
+        bad PDF does not stop a bulk run.
+    """
+    result = {"file_name": os.path.basename(path), "score": None,
+              "key_points": [], "error": None}
+    try:
+        backend = get_backend(backend)
+        model = backend.load_model(model_path) if model_path else None
+        resume_text = extract_text_from_pdf(path, workers=1)
+        result["score"] = float(rank_resumes(
+            job_description, [resume_text], model=model, backend=backend)[0])
+        result["key_points"] = generate_key_points(resume_text)
+    except Exception as error:  # reported per resume
+        result["error"] = f"{type(error).__name__}: {error}"
+    return result
+
+
+class _JsonlWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, result):
+        self.stream.write(json.dumps(result) + "\n")
+        self.stream.flush()
+
+
+class _CsvWriter:
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, result):
+        self.writer.writerow(dict(result, key_points="; ".join(result["key_points"])))
+        self.stream.flush()
+
+
+def _output_format(args):
+    if args.format:
+        return args.format
+    if args.out and args.out.lower().endswith(".csv"):
+        return "csv"
+    return "jsonl"
+
+
+def score_command(args):
+    with open(args.jd, encoding="utf-8") as handle:
+        job_description = handle.read()
+
+    paths = []
+    for source in args.resumes:
+        paths.extend(list_resume_files(source) if os.path.isdir(source)
+                     else [source])
+
+    model_path = args.model
+    if model_path is None and os.path.exists(DEFAULT_MODEL_PATH):
+        model_path = DEFAULT_MODEL_PATH
+
+    stream = open(args.out, "w", encoding="utf-8", newline="") \
+        if args.out else sys.stdout
+    writer = (_CsvWriter if _output_format(args) == "csv" else _JsonlWriter)(stream)
+    failures = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [pool.submit(score_resume, job_description, path,
+                                   model_path, args.backend)
+                       for path in paths]
+            for future in as_completed(futures):
+                result = future.result()
+                failures += result["error"] is not None
+                writer.write(result)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    print(f"Scored {len(paths) - failures}/{len(paths)} resumes", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def build_model_command(args):
+    model = build_corpus_model(args.corpus)
+    save_corpus_model(model, args.output)
+    print(f"Saved corpus model with {len(model.vocabulary_)} terms "
+          f"to {args.output}", file=sys.stderr)
+    return 0
+
+
+def _open_deduplicator(directory, args):
+    # The signatures of earlier runs are kept with the store, so new
+    # resumes are also checked against the ones already in it
+    if not args.dedup:
+        return None
+    path = os.path.join(directory, SIGNATURES_FILE)
+    if os.path.exists(path):
+        return Deduplicator.load(path)
+    return Deduplicator(args.dedup_threshold)
+
+
+def _close_deduplicator(dedup, directory):
+    if dedup is None:
+        return
+    os.makedirs(directory, exist_ok=True)
+    dedup.save(os.path.join(directory, SIGNATURES_FILE))
+    stats = dedup.stats()
+    print(f"Dropped {stats['duplicates']}/{stats['documents']} near-duplicates "
+          f"({stats['dedup_ratio']:.1%}); deduplication took "
+          f"{stats['seconds']:.2f}s and saved about "
+          f"{stats['seconds_saved']:.2f}s", file=sys.stderr)
+
+
+def index_add_command(args):
+    from resume_analyser.index import ResumeIndex
+
+    index = ResumeIndex(args.index, model=load_corpus_model(args.model))
+    dedup = _open_deduplicator(args.index, args)
+    added = []
+    for source in args.resumes:
+        added.extend(index.add_resumes(
+            source if os.path.isdir(source) else [source], dedup=dedup))
+    if args.compact:
+        index.compact()
+    _close_deduplicator(dedup, args.index)
+    print(f"Added {len(added)} resumes; the index now holds {len(index)}",
+          file=sys.stderr)
+    return 0
+
+
+def ingest_command(args):
+    from resume_analyser.streaming import StreamingStore
+
+    # Options left out keep the store's defaults
+    options = {name: getattr(args, name) for name in ("n_features", "chunk_size")
+               if getattr(args, name) is not None}
+    store = StreamingStore(args.store, refresh_every=args.refresh_every,
+                           **options)
+
+    def resumes():
+        for source in args.resumes:
+            yield from (list_resume_files(source) if os.path.isdir(source)
+                        else [source])
+
+    dedup = _open_deduplicator(args.store, args)
+    added = store.ingest_resumes(resumes(), dedup=dedup)
+    store.finalize()
+    _close_deduplicator(dedup, args.store)
+    print(f"Ingested {added} resumes; the store now holds {len(store)}",
+          file=sys.stderr)
+    return 0
+
+
+def vectors_build_command(args):
+    from resume_analyser.vector_store import build_vector_store
+
+    resumes = []
+    for source in args.resumes:
+        resumes.extend(list_resume_files(source) if os.path.isdir(source)
+                       else [source])
+    store = build_vector_store(args.vectors, resumes,
+                               model=load_corpus_model(args.model))
+    print(f"Stored the vectors of {len(store)} resumes", file=sys.stderr)
+    return 0
+
+
+def ann_build_command(args):
+    from resume_analyser.ann import build_ann_index
+
+    resumes = []
+    for source in args.resumes:
+        resumes.extend(list_resume_files(source) if os.path.isdir(source)
+                       else [source])
+    params = {name: getattr(args, name)
+              for name in ("projection", "n_components", "n_clusters", "n_probe")
+              if getattr(args, name) is not None}
+    index = build_ann_index(args.ann, resumes,
+                            model=load_corpus_model(args.model), **params)
+    print(f"Indexed {len(index)} resumes in "
+          f"{len(index.centroids_)} clusters", file=sys.stderr)
+    return 0
+
+
+def search_command(args):
+    with open(args.jd, encoding="utf-8") as handle:
+        job_description = handle.read()
+
+    if args.index:
+        from resume_analyser.index import ResumeIndex
+
+        try:
+            searcher = ResumeIndex(args.index, create=False)
+        except FileNotFoundError as error:
+            print(error, file=sys.stderr)
+            return 1
+    elif args.store:
+        from resume_analyser.streaming import StreamingStore
+
+        searcher = StreamingStore(args.store)
+    elif args.ann:
+        from resume_analyser.ann import AnnIndex
+
+        searcher = AnnIndex.load(args.ann)
+    else:
+        from resume_analyser.vector_store import VectorStore
+
+        searcher = VectorStore(args.vectors)
+    writer = _JsonlWriter(sys.stdout)
+    for result in searcher.search(job_description, args.top_k):
+        writer.write(result)
+    return 0
+
+
+def match_command(args):
+    from resume_analyser.matching import MatchMatrix
+
+    jobs = []
+    for source in args.jds:
+        jobs.extend(sorted(os.path.join(source, name)
+                           for name in os.listdir(source)
+                           if name.lower().endswith(".txt"))
+                    if os.path.isdir(source) else [source])
+    job_descriptions = []
+    for path in jobs:
+        with open(path, encoding="utf-8") as handle:
+            job_descriptions.append(handle.read())
+
+    resumes = []
+    for source in args.resumes:
+        resumes.extend(list_resume_files(source) if os.path.isdir(source)
+                       else [source])
+    texts = [extract_text_from_pdf(path) for path in resumes]
+
+    model_path = args.model
+    if model_path is None and os.path.exists(DEFAULT_MODEL_PATH):
+        model_path = DEFAULT_MODEL_PATH
+    matches = MatchMatrix(job_descriptions, texts,
+                          model=load_corpus_model(model_path) if model_path else None)
+
+    writer = _JsonlWriter(sys.stdout)
+    if args.by_resume:
+        best, scores = matches.best_jobs()
+        for path, job, score in zip(resumes, best, scores):
+            writer.write({"file_name": os.path.basename(path),
+                          "job": os.path.basename(jobs[job]) if jobs else None,
+                          "score": float(score)})
+    else:
+        for path, (best, scores) in zip(jobs, matches.top_resumes(args.top_k)):
+            writer.write({
+                "job": os.path.basename(path),
+                "matches": [{"file_name": os.path.basename(resumes[i]),
+                             "score": float(score)}
+                            for i, score in zip(best, scores)],
+            })
+    return 0
+
+
+def rules_check_command(args):
+    try:
+        rules = load_rules(args.rules)
+    except (OSError, RuleError) as error:
+        print(f"Invalid rules file {args.rules}: {error}", file=sys.stderr)
+        return 1
+    videos = sum(len(rule.videos) for rule in rules.rules)
+    print(f"{args.rules}: {len(rules)} rules, {len(rules.rules_by_phrase)} "
+          f"phrases, {videos} videos", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m resume_analyser",
+        description="Smart Resume Analyser command-line tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser(
+        "score", help="Score resumes against a job description")
+    score.add_argument("--jd", required=True,
+                       help="Text file holding the job description")
+    score.add_argument("--resumes", required=True, nargs="+",
+                       help="PDF files or directories of PDF resumes")
+    score.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                       help="Number of worker processes (default: CPU count)")
+    score.add_argument("--out",
+                       help="Output file; .csv selects CSV (default: stdout)")
+    score.add_argument("--format", choices=["jsonl", "csv"],
+                       help="Output format (default: from --out, else jsonl)")
+    score.add_argument("--model",
+                       help="Saved corpus model (default: the model built "
+                            "by build-model, if present)")
+    score.add_argument("--backend", choices=sorted(BACKENDS),
+                       default=DEFAULT_BACKEND,
+                       help=f"Scoring backend (default: {DEFAULT_BACKEND})")
+    score.set_defaults(func=score_command)
+
+    build = commands.add_parser(
+        "build-model", help="Fit the TF-IDF corpus model over a folder of resumes")
+    build.add_argument("corpus", help="Directory of PDF resumes")
+    build.add_argument("-o", "--output", default=DEFAULT_MODEL_PATH,
+                       help="Where to save the model")
+    build.set_defaults(func=build_model_command)
+
+    index_add = commands.add_parser(
+        "index-add", help="Add resumes to a persistent search index")
+    index_add.add_argument("--index", required=True, help="Index directory")
+    index_add.add_argument("resumes", nargs="+",
+                           help="PDF files or directories of PDF resumes")
+    index_add.add_argument("--model", default=DEFAULT_MODEL_PATH,
+                           help="Corpus model for a new index (default: the "
+                                "model built by build-model, if present)")
+    index_add.add_argument("--compact", action="store_true",
+                           help="Merge the index segments after adding")
+    index_add.add_argument("--dedup", action="store_true",
+                           help="Drop near-duplicates of resumes already seen")
+    index_add.add_argument("--dedup-threshold", type=float,
+                           default=DEFAULT_THRESHOLD,
+                           help="Estimated similarity from which a resume is a "
+                                f"near-duplicate (default: {DEFAULT_THRESHOLD})")
+    index_add.set_defaults(func=index_add_command)
+
+    ingest = commands.add_parser(
+        "ingest", help="Stream resumes into a hashed store with flat memory")
+    ingest.add_argument("--store", required=True, help="Store directory")
+    ingest.add_argument("resumes", nargs="+",
+                        help="PDF files or directories of PDF resumes")
+    ingest.add_argument("--chunk-size", type=int,
+                        help="Resumes per chunk (default: 256)")
+    ingest.add_argument("--refresh-every", type=int,
+                        help="Refresh the IDF weights every N chunks "
+                             "(default: only at the end)")
+    ingest.add_argument("--n-features", type=int,
+                        help="Hash columns of a new store (default: 2**20)")
+    ingest.add_argument("--dedup", action="store_true",
+                        help="Drop near-duplicates of resumes already seen")
+    ingest.add_argument("--dedup-threshold", type=float,
+                        default=DEFAULT_THRESHOLD,
+                        help="Estimated similarity from which a resume is a "
+                             f"near-duplicate (default: {DEFAULT_THRESHOLD})")
+    ingest.set_defaults(func=ingest_command)
+
+    vectors_build = commands.add_parser(
+        "vectors-build",
+        help="Vectorise resumes once into a memory-mapped vector store")
+    vectors_build.add_argument("--vectors", required=True,
+                               help="Vector store directory")
+    vectors_build.add_argument("resumes", nargs="+",
+                               help="PDF files or directories of PDF resumes")
+    vectors_build.add_argument("--model", default=DEFAULT_MODEL_PATH,
+                               help="Corpus model to vectorise with (default: "
+                                    "the model built by build-model, if present)")
+    vectors_build.set_defaults(func=vectors_build_command)
+
+    ann_build = commands.add_parser(
+        "ann-build",
+        help="Build an approximate nearest-neighbour index for large pools")
+    ann_build.add_argument("--ann", required=True, help="ANN index directory")
+    ann_build.add_argument("resumes", nargs="+",
+                           help="PDF files or directories of PDF resumes")
+    ann_build.add_argument("--model", default=DEFAULT_MODEL_PATH,
+                           help="Corpus model to vectorise with (default: "
+                                "the model built by build-model, if present)")
+    ann_build.add_argument("--projection", choices=["svd", "random"],
+                           help="Dimensionality reduction (default: svd)")
+    ann_build.add_argument("--n-components", type=int,
+                           help="Dimension of the projected space "
+                                "(default: 128)")
+    ann_build.add_argument("--n-clusters", type=int,
+                           help="IVF clusters (default: about the square "
+                                "root of the number of resumes)")
+    ann_build.add_argument("--n-probe", type=int,
+                           help="Clusters scanned per query (default: 8)")
+    ann_build.set_defaults(func=ann_build_command)
+
+    search = commands.add_parser(
+        "search", help="Search a persistent index with a job description")
+    source = search.add_mutually_exclusive_group(required=True)
+    source.add_argument("--index", help="Index directory")
+    source.add_argument("--store", help="Streaming store directory")
+    source.add_argument("--vectors", help="Vector store directory")
+    source.add_argument("--ann", help="ANN index directory (approximate)")
+    search.add_argument("--jd", required=True,
+                        help="Text file holding the job description")
+    search.add_argument("-k", "--top-k", type=int, default=10,
+                        help="Number of results (default: 10)")
+    search.set_defaults(func=search_command)
+
+    match = commands.add_parser(
+        "match", help="Score many job descriptions against many resumes")
+    match.add_argument("--jds", required=True, nargs="+",
+                       help="Job description text files or directories of them")
+    match.add_argument("--resumes", required=True, nargs="+",
+                       help="PDF files or directories of PDFs")
+    match.add_argument("-k", "--top-k", type=int, default=10,
+                       help="Resumes per job description (default: 10)")
+    match.add_argument("--by-resume", action="store_true",
+                       help="Write the best job description for each resume "
+                            "instead")
+    match.add_argument("--model",
+                       help="Saved corpus model (default: the model built by "
+                            "build-model, if present)")
+    match.set_defaults(func=match_command)
+
+    rules_check = commands.add_parser(
+        "rules-check", help="Validate a suggestion rules file")
+    rules_check.add_argument("rules", nargs="?", default=RULES_PATH,
+                             help="Rules file (default: the rules in use)")
+    rules_check.set_defaults(func=rules_check_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,154 @@
+"""
+Pre-fitted TF-IDF corpus model.
+
+The vocabulary and IDF weights are fitted once, offline, over a reference
+corpus of resumes and saved to disk. Scoring then only has to ``transform``
+the job description and resumes, which is faster than refitting and keeps
+scores comparable from one request to the next.
+
+Next to the joblib model, its IDF weights are saved as a table keyed by
+hashed term id (``<model>.idf.npz``) for the pure-NumPy scoring backend,
+which can then score without importing scikit-learn.
+
+Build the model with:
+    python -m resume_analyser.corpus_model resume_dataset/ -o models/corpus_tfidf.joblib
+"""
+import argparse
+import functools
+import os
+
+from resume_analyser.engine import extract_text_from_pdf, list_resume_files
+
+DEFAULT_MODEL_PATH = os.environ.get(
+    "RESUME_ANALYSER_MODEL",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 "models", "corpus_tfidf.joblib"),
+)
+
+
+def idf_table_path(model_path):
+    """
+    Returns where the IDF table of a corpus model is stored.
+
+    Args:
+        model_path (str): The corpus model file.
+
+    Returns:
+        str: The path of its ``.idf.npz`` table.
+    """
+    return os.path.splitext(model_path)[0] + ".idf.npz"
+
+
+def build_corpus_model(corpus):
+    """
+    Fits the TF-IDF vocabulary and IDF weights over a reference corpus.
+
+    Args:
+        corpus (str or list): A directory of PDF resumes, or a list of
+            resume texts.
+
+    Returns:
+        TfidfVectorizer: The fitted vectorizer.
+    """
+    if isinstance(corpus, (str, os.PathLike)):
+        corpus = [extract_text_from_pdf(path)
+                  for path in list_resume_files(corpus)]
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit(corpus)
+    return vectorizer
+
+
+def save_corpus_model(model, path=DEFAULT_MODEL_PATH):
+    """
+    Saves a fitted corpus model, and its IDF table, to disk.
+
+    Args:
+        model (TfidfVectorizer): The fitted vectorizer.
+        path (str): Where to write the model file.
+    """
+    import joblib
+
+    from resume_analyser.tfidf import IdfTable
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    joblib.dump(model, path)
+    IdfTable.from_vectorizer(model).save(idf_table_path(path))
+
+
+def _cache_key(path):
+    # One cache entry per file, however its path is spelled
+    return os.path.abspath(path or DEFAULT_MODEL_PATH)
+
+
+def load_corpus_model(path=None):
+    """
+    Loads a saved corpus model, once per process and file.
+
+    Args:
+        path (str, optional): The model file written by
+            ``save_corpus_model``; defaults to ``DEFAULT_MODEL_PATH``.
+
+    Returns:
+        TfidfVectorizer: The fitted vectorizer, or None if no model file
+        exists at ``path``.
+    """
+    return _load_corpus_model(_cache_key(path))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_corpus_model(path):
+    if not os.path.exists(path):
+        return None
+    # Unpickling the model imports scikit-learn, so it happens here, on the
+    # first scoring request, rather than at import time.
+    import joblib
+
+    return joblib.load(path)
+
+
+def load_idf_table(path=None):
+    """
+    Loads the IDF table of a saved corpus model, once per process and file.
+
+    Args:
+        path (str, optional): The model file written by
+            ``save_corpus_model``; defaults to ``DEFAULT_MODEL_PATH``.
+
+    Returns:
+        IdfTable: The table, or None if it does not exist; models saved
+        before the table was introduced need to be rebuilt.
+    """
+    return _load_idf_table(_cache_key(path))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_idf_table(path):
+    table_path = idf_table_path(path)
+    if not os.path.exists(table_path):
+        return None
+    from resume_analyser.tfidf import IdfTable
+
+    return IdfTable.load(table_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fit the TF-IDF corpus model over a folder of resumes.")
+    parser.add_argument("corpus", help="Directory of PDF resumes")
+    parser.add_argument("-o", "--output", default=DEFAULT_MODEL_PATH,
+                        help="Where to save the model")
+    args = parser.parse_args()
+
+    model = build_corpus_model(args.corpus)
+    save_corpus_model(model, args.output)
+    print(f"Saved corpus model with {len(model.vocabulary_)} terms "
+          f"to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Near-duplicate resume detection with MinHash and LSH.
+
+Candidate pools often hold the same CV several times with small edits, and
+each copy would otherwise be vectorised, stored and scored in full. Each
+extracted text is reduced to a MinHash signature over its word shingles;
+the fraction of equal signature values estimates the Jaccard similarity of
+two documents' shingle sets. Signatures are split into bands and every band
+is hashed into a bucket (locality-sensitive hashing), so a new document is
+only compared with the documents sharing a bucket with it rather than with
+every document seen, and candidates are confirmed by their estimated
+similarity.
+
+``Deduplicator.check`` is called after extraction, before a document is
+vectorised, and returns the document it duplicates, if any, so callers can
+drop the copy and link it to the original.
+"""
+import time
+import zlib
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5
+
+# Where the command-line tools keep a store's signatures
+SIGNATURES_FILE = "minhash.npz"
+
+# Multiplier combining the word hashes of a shingle (the 64-bit FNV prime)
+_SHINGLE_MULTIPLIER = np.uint64(0x100000001B3)
+
+# Bands are chosen so a pair right at the threshold becomes a candidate with
+# at least this probability
+_CANDIDATE_RECALL = 0.9
+
+
+def shingles(text, size=DEFAULT_SHINGLE_SIZE):
+    """
+    Hashes the word shingles of a text.
+
+    Words are hashed once and each run of ``size`` word hashes is combined
+    into a 64-bit shingle hash, all in NumPy.
+
+    Args:
+        text (str): The document.
+        size (int): Words per shingle. Texts with fewer words form a single
+            shingle.
+
+    Returns:
+        numpy.ndarray: The distinct shingle hashes, as ``uint64``.
+    """
+    words = text.lower().split()
+    hashes = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words),
+                         dtype=np.uint64, count=len(words))
+    if not len(hashes):
+        return hashes
+    n_shingles = max(1, len(hashes) - size + 1)
+    combined = np.zeros(n_shingles, dtype=np.uint64)
+    for offset in range(min(size, len(hashes))):
+        # Wraps around modulo 2**64
+        combined = combined * _SHINGLE_MULTIPLIER + hashes[offset:offset + n_shingles]
+    return np.unique(combined)
+
+
+def lsh_bands(threshold, num_perm):
+    """
+    Chooses the LSH banding for a similarity threshold.
+
+    Takes the most rows per band (the fewest false candidates) for which a
+    pair exactly at the threshold still shares a band with probability
+    ``_CANDIDATE_RECALL``.
+
+    Args:
+        threshold (float): The Jaccard similarity of a near-duplicate.
+        num_perm (int): The signature length.
+
+    Returns:
+        tuple: ``(bands, rows)`` with ``bands * rows <= num_perm``.
+    """
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= _CANDIDATE_RECALL:
+            return bands, rows
+    return num_perm, 1
+
+
+def link_duplicates(documents, duplicates):
+    """
+    Records dropped duplicates on the stored documents they duplicate.
+
+    Args:
+        documents (list): Stored document metadata dicts with a ``digest``.
+        duplicates (dict): Digest of an original -> metadata dicts of its
+            duplicates, added to the original's ``duplicates`` list unless
+            already listed there or the same file as the original.
+    """
+    by_digest = {document.get("digest"): document for document in documents}
+    for digest, copies in duplicates.items():
+        document = by_digest.get(digest)
+        if document is None:
+            continue
+        listed = document.setdefault("duplicates", [])
+        known = {(copy.get("digest"), copy.get("file_name"))
+                 for copy in [document] + listed}
+        for copy in copies:
+            identity = (copy.get("digest"), copy.get("file_name"))
+            if identity not in known:
+                known.add(identity)
+                listed.append(copy)
+        if not listed:
+            del document["duplicates"]
+
+
+class Deduplicator:
+    """
+    Finds near-duplicate documents among those seen so far.
+
+    Args:
+        threshold (float): Estimated Jaccard similarity of the shingle sets
+            from which a document counts as a duplicate.
+        num_perm (int): MinHash signature length; longer is more accurate
+            and slower.
+        shingle_size (int): Words per shingle.
+        seed (int): Seed of the hash permutations. Signatures are only
+            comparable between deduplicators with the same seed and length.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd multipliers, top 32 bits kept
+        self._a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * 2 + 1
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+
+        self.keys = []
+        self.signatures = []
+        self._buckets = [{} for _ in range(self.bands)]
+        self.documents = 0
+        self.duplicates = 0
+        self.seconds = 0.0
+        # Time callers spent processing the unique documents, for
+        # estimating what skipping the duplicates saved
+        self.processing_seconds = 0.0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def signature(self, text):
+        """
+        Computes the MinHash signature of a text.
+
+        Args:
+            text (str): The document.
+
+        Returns:
+            numpy.ndarray: ``num_perm`` minimum hash values, or None for a
+            text without words.
+        """
+        hashes = shingles(text, self.shingle_size)
+        if not len(hashes):
+            return None
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) >> 32
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes()
+                for i in range(self.bands)]
+
+    def _add(self, key, signature):
+        index = len(self.keys)
+        self.keys.append(key)
+        self.signatures.append(signature)
+        for bucket, band in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(band, []).append(index)
+
+    def find(self, signature):
+        """
+        Finds the most similar stored document above the threshold.
+
+        Args:
+            signature (numpy.ndarray): A signature from ``signature``.
+
+        Returns:
+            tuple: ``(key, similarity)`` of the best match, or None.
+        """
+        candidates = set()
+        for bucket, band in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band, ()))
+        best = None
+        for index in candidates:
+            similarity = float(np.mean(self.signatures[index] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (self.keys[index], similarity)
+        return best
+
+    def check(self, key, text):
+        """
+        Checks a document against those seen so far and remembers it.
+
+        Documents without words are never reported as duplicates.
+
+        Args:
+            key (hashable): The document's identifier, e.g. its content hash.
+            text (str): The extracted text.
+
+        Returns:
+            object: The key of the document this one duplicates, or None if
+            it is new; only new documents are remembered, so every
+            duplicate links to an original.
+        """
+        start = time.perf_counter()
+        self.documents += 1
+        signature = self.signature(text)
+        match = self.find(signature) if signature is not None else None
+        if match is None:
+            if signature is not None:
+                self._add(key, signature)
+        else:
+            self.duplicates += 1
+        self.seconds += time.perf_counter() - start
+        return match[0] if match is not None else None
+
+    def stats(self):
+        """
+        Summarises the documents checked so far.
+
+        Returns:
+            dict: ``documents``, ``duplicates``, ``dedup_ratio`` (the
+            fraction of documents that were duplicates), ``seconds`` spent
+            deduplicating, and ``seconds_saved``: the duplicates times the
+            average ``processing_seconds`` of a unique document, less the
+            time spent deduplicating.
+        """
+        unique = self.documents - self.duplicates
+        per_document = self.processing_seconds / unique if unique else 0.0
+        return {
+            "documents": self.documents,
+            "duplicates": self.duplicates,
+            "dedup_ratio": self.duplicates / self.documents if self.documents else 0.0,
+            "seconds": self.seconds,
+            "seconds_saved": self.duplicates * per_document - self.seconds,
+        }
+
+    def save(self, path):
+        """
+        Saves the remembered signatures, so later runs dedupe against them.
+
+        Args:
+            path (str): The ``.npz`` file to write.
+        """
+        np.savez(path,
+                 settings=np.array([self.threshold, self.num_perm,
+                                    self.shingle_size, self.seed]),
+                 keys=np.array(self.keys, dtype=str),
+                 signatures=np.array(self.signatures, dtype=np.uint64).reshape(
+                     len(self.keys), self.num_perm))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads signatures written by ``save``.
+
+        Args:
+            path (str): The ``.npz`` file.
+
+        Returns:
+            Deduplicator: A deduplicator remembering the saved documents.
+        """
+        with np.load(path) as arrays:
+            threshold, num_perm, shingle_size, seed = arrays["settings"].tolist()
+            deduplicator = cls(threshold, int(num_perm), int(shingle_size),
+                               int(seed))
+            for key, signature in zip(arrays["keys"].tolist(),
+                                      arrays["signatures"]):
+                deduplicator._add(key, signature)
+        return deduplicator
@@ -0,0 +1,306 @@
+"""
+Core scoring engine for the Smart Resume Analyser.
+
+Holds the PDF extraction, TF-IDF ranking and suggestion logic so it can be
+imported without running the Streamlit script.
+
+NumPy and scikit-learn are imported inside the functions that use them, so
+importing the package (and rendering the app's landing page) stays cheap;
+see ``resume_analyser.warmup``.
+"""
+import os
+import time
+
+from resume_analyser.backends import get_backend
+from resume_analyser.extraction import extract_pdf_text
+from resume_analyser.keywords import match_key_points
+from resume_analyser.metrics import stage
+from resume_analyser.pdf_cache import file_digest
+
+# Function to extract text from a PDF file
+
+
+def extract_text_from_pdf(file, cache=None, workers=None):
+    """
+    Extracts text from a PDF file.
+
+    Args:
+        file (PdfReader): The PDF file to extract text from.
+        cache (TextCache, optional): A cache keyed by the file's content
+            hash (see ``resume_analyser.pdf_cache``). On a hit the PDF is not
+            parsed at all.
+        workers (int, optional): Worker processes for page-parallel
+            extraction of long documents (see ``resume_analyser.extraction``).
+            1 forces serial extraction.
+
+    Returns:
+        str: The extracted text.
+    """
+    with stage("extraction") as info:
+        if cache is not None:
+            key = file_digest(file)
+            text = cache.get(key)
+            info["cache_hit"] = text is not None
+            if text is not None:
+                info["text_length"] = len(text)
+                return text
+
+        text = extract_pdf_text(file, workers=workers, info=info)
+        info["text_length"] = len(text)
+
+    if cache is not None:
+        cache.put(key, text)
+    return text
+
+# Function to rank resumes based on their job description
+
+
+def sparse_cosine_scores(job_description_vector, resume_vectors):
+    """
+    Computes cosine similarities without densifying the TF-IDF matrix.
+
+    TfidfVectorizer L2-normalises every row, so the cosine similarity is
+    just the sparse dot product of the job description row with each resume
+    row.
+
+    Args:
+        job_description_vector (scipy.sparse matrix): A 1 x V TF-IDF row.
+        resume_vectors (scipy.sparse matrix): An N x V TF-IDF matrix.
+
+    Returns:
+        numpy.ndarray: The N cosine similarities.
+    """
+    return (resume_vectors @ job_description_vector.T).toarray().ravel()
+
+
+def top_k_scores(scores, k):
+    """
+    Selects the k highest scores with a partial sort.
+
+    Args:
+        scores (numpy.ndarray): Scores to select from.
+        k (int): Number of results to keep.
+
+    Returns:
+        tuple: ``(indices, scores)`` arrays for the k best entries, sorted
+        from best to worst.
+    """
+    import numpy as np
+
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=np.intp), scores[:0]
+
+    indices = np.argpartition(-scores, k - 1)[:k]
+    indices = indices[np.argsort(-scores[indices], kind="stable")]
+    return indices, scores[indices]
+
+
+def vectorize_documents(documents, model=None):
+    """
+    Turns documents into TF-IDF vectors.
+
+    Args:
+        documents (list): The texts to vectorise.
+        model (TfidfVectorizer, optional): A vectorizer already fitted on a
+            reference corpus. Without one, a new vectorizer is fitted on
+            ``documents`` themselves.
+
+    Returns:
+        tuple: ``(vectorizer, vectors)`` where ``vectors`` is a sparse matrix
+        with one row per document.
+    """
+    if model is None:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        model = TfidfVectorizer()
+        return model, model.fit_transform(documents)
+    return model, model.transform(documents)
+
+
+def rank_resumes(job_description, resumes, top_k=None, model=None,
+                 backend=None, explain=None):
+    """
+    Ranks resumes based on their similarity to the job description.
+
+    Args:
+        job_description (str): The job description.
+        resumes (list): A list of resume texts.
+        top_k (int, optional): If given, only the k best matches are returned.
+        model (object, optional): A pre-fitted corpus model (see
+            ``resume_analyser.corpus_model``), as returned by the backend's
+            ``load_model``. When given, the documents are only transformed,
+            so scores are comparable across calls.
+        backend (str or ScoringBackend, optional): The scoring backend (see
+            ``resume_analyser.backends``). Defaults to
+            ``RESUME_ANALYSER_BACKEND`` or ``"sklearn"``.
+        explain (int, optional): If given, also explains each score with up
+            to this many of its top contributing terms and of the job
+            description terms the resume lacks, read from the same TF-IDF
+            weights the score is computed from.
+
+    Returns:
+        numpy.ndarray: The cosine similarity between the job description and
+        each resume. When ``top_k`` is given, a tuple ``(indices, scores)``
+        of the k best resumes instead, sorted from best to worst. When
+        ``explain`` is given, a tuple of that result and a list with one
+        explanation per resume, in the order of ``resumes`` (see
+        ``ScoringBackend.explain``).
+    """
+    backend = get_backend(backend)
+
+    # The job description is scored together with the resumes; the vectors
+    # stay sparse all the way through scoring
+    with stage("ranking", documents=len(resumes) + 1) as info:
+        if explain is None:
+            cosine_similarities = backend.score(job_description, resumes,
+                                                model, info)
+        else:
+            cosine_similarities, explanations = backend.explain(
+                job_description, resumes, model, info, n_terms=explain)
+
+    result = cosine_similarities
+    if top_k is not None:
+        result = top_k_scores(cosine_similarities, top_k)
+    if explain is not None:
+        return result, explanations
+    return result
+
+# Function to generate key points based on resume content
+
+
+def generate_key_points(resume_text):
+    """
+    Generates key points based on the content of the resume.
+
+    Args:
+        resume_text (str): The text of the resume.
+
+    Returns:
+        list: A list of key points for resume improvement.
+    """
+    key_points = []
+    with stage("suggestions", text_length=len(resume_text)):
+        for suggestion, _, _ in match_key_points(resume_text):
+            if suggestion not in key_points:
+                key_points.append(suggestion)
+    return key_points
+
+# Function to rank a whole batch of resume files in one pass
+
+
+def list_resume_files(directory):
+    """
+    Lists the PDF files in a directory, sorted by name.
+
+    Args:
+        directory (str): Path to the folder holding the resumes.
+
+    Returns:
+        list: Paths of the PDF files found in the directory.
+    """
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.lower().endswith(".pdf")
+    ]
+
+
+def _file_name(file):
+    """
+    Returns a display name for a path or an uploaded file object.
+
+    Args:
+        file (str or file-like): A path or an object with a ``name`` attribute.
+
+    Returns:
+        str: The base name of the file.
+    """
+    name = getattr(file, "name", file)
+    return os.path.basename(str(name))
+
+
+def rank_resume_batch(job_description, resumes, top_n_terms=5, model=None,
+                      cache=None, dedup=None):
+    """
+    Ranks a batch of resume PDFs against one job description.
+
+    All resumes are extracted first and then scored with a single TF-IDF fit
+    and a single cosine similarity pass, instead of one fit per resume.
+
+    Args:
+        job_description (str): The job description.
+        resumes (str or list): A directory of PDF resumes, or a list of paths
+            or uploaded file objects.
+        top_n_terms (int): How many matching terms to report per resume.
+        model (TfidfVectorizer, optional): A pre-fitted corpus model to
+            transform with instead of fitting on the batch.
+        cache (TextCache, optional): Cache for the extracted resume text.
+        dedup (Deduplicator, optional): A new
+            ``resume_analyser.dedup.Deduplicator``. Near-duplicate resumes
+            are then scored only once: each copy gets the score and terms
+            of the first resume it duplicates.
+
+    Returns:
+        list: One dict per resume with ``file_name``, ``score`` and
+        ``top_terms`` keys, sorted from best to worst match. With ``dedup``,
+        each also has ``duplicate_of``: the file name of the resume it
+        duplicates, or None.
+    """
+    if isinstance(resumes, (str, os.PathLike)):
+        resumes = list_resume_files(resumes)
+
+    file_names = [_file_name(file) for file in resumes]
+    resume_texts = [extract_text_from_pdf(file, cache) for file in resumes]
+    if not resume_texts:
+        return []
+
+    # Duplicates are dropped before vectorisation and filled in afterwards
+    originals = {}
+    if dedup is not None:
+        unique = []
+        for i, text in enumerate(resume_texts):
+            original = dedup.check(i, text)
+            if original is None:
+                unique.append(i)
+            else:
+                originals[i] = original
+        all_names, file_names = file_names, [file_names[i] for i in unique]
+        resume_texts = [resume_texts[i] for i in unique]
+        start = time.perf_counter()
+
+    with stage("batch_ranking", documents=len(resume_texts) + 1) as info:
+        vectorizer, vectors = vectorize_documents(
+            [job_description] + resume_texts, model)
+        info["vocabulary_size"] = vectors.shape[1]
+        job_description_vector = vectors[0]
+        resume_vectors = vectors[1:]
+        scores = sparse_cosine_scores(job_description_vector, resume_vectors)
+
+    # Terms shared with the job description, weighted by their contribution
+    # to the cosine score.
+    terms = vectorizer.get_feature_names_out()
+    contributions = resume_vectors.multiply(job_description_vector).tocsr()
+
+    leaderboard = []
+    for i, file_name in enumerate(file_names):
+        row = contributions.getrow(i)
+        order = row.data.argsort()[::-1][:top_n_terms]
+        leaderboard.append({
+            "file_name": file_name,
+            "score": float(scores[i]),
+            "top_terms": [str(terms[row.indices[j]]) for j in order],
+        })
+
+    if dedup is not None:
+        dedup.processing_seconds += time.perf_counter() - start
+        entries = dict(zip(unique, leaderboard))
+        for entry in leaderboard:
+            entry["duplicate_of"] = None
+        for i, original in originals.items():
+            leaderboard.append(dict(entries[original], file_name=all_names[i],
+                                    duplicate_of=all_names[original]))
+
+    leaderboard.sort(key=lambda entry: entry["score"], reverse=True)
+    return leaderboard
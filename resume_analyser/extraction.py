@@ -0,0 +1,121 @@
+"""
+Page-parallel PDF text extraction.
+
+PyPDF2 text extraction is CPU-bound, so long documents are split into page
+ranges that are extracted in a shared process pool and joined once. Short
+documents, such as most CVs, are extracted serially because starting the
+work in another process would cost more than it saves.
+"""
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from resume_analyser.pdf_cache import read_file_bytes
+
+DEFAULT_WORKERS = int(os.environ.get("RESUME_ANALYSER_PDF_WORKERS",
+                                     os.cpu_count() or 1))
+PARALLEL_MIN_PAGES = int(os.environ.get("RESUME_ANALYSER_PARALLEL_MIN_PAGES", 8))
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_process_pool(workers):
+    """
+    Returns the shared process pool for a worker count, creating it once.
+
+    Args:
+        workers (int): Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # "spawn" keeps the workers independent of the threads running
+            # in the Streamlit or HTTP server process.
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"))
+            _pools[workers] = pool
+        return pool
+
+
+def page_ranges(page_count, chunks):
+    """
+    Splits pages into contiguous, near-equal ranges.
+
+    Args:
+        page_count (int): Number of pages in the document.
+        chunks (int): Number of ranges wanted.
+
+    Returns:
+        list: ``(start, stop)`` pairs covering every page in order.
+    """
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _extract_page_range(data, start, stop):
+    """
+    Extracts the text of a range of pages; runs in a worker process.
+
+    Args:
+        data (bytes): The whole PDF.
+        start (int): First page index.
+        stop (int): One past the last page index.
+
+    Returns:
+        str: The text of the pages, concatenated.
+    """
+    from PyPDF2 import PdfReader
+
+    pdf = PdfReader(io.BytesIO(data))
+    return "".join(pdf.pages[i].extract_text() for i in range(start, stop))
+
+
+def extract_pdf_text(file, workers=None, min_pages=PARALLEL_MIN_PAGES,
+                     info=None):
+    """
+    Extracts the text of a PDF, in parallel for long documents.
+
+    Args:
+        file (str or file-like): The PDF to extract text from.
+        workers (int, optional): Number of worker processes. Defaults to
+            ``RESUME_ANALYSER_PDF_WORKERS`` or the CPU count; 1 forces
+            serial extraction.
+        min_pages (int): Documents with fewer pages are extracted serially.
+        info (dict, optional): Stage details to record the page count in.
+
+    Returns:
+        str: The extracted text, identical to page-by-page serial extraction.
+    """
+    if workers is None:
+        workers = DEFAULT_WORKERS
+
+    # Imported on first use: PyPDF2 is not needed until a PDF arrives
+    from PyPDF2 import PdfReader
+
+    pdf = PdfReader(file)
+    page_count = len(pdf.pages)
+    if info is not None:
+        info["pages"] = page_count
+    if workers <= 1 or page_count < min_pages:
+        return "".join(page.extract_text() for page in pdf.pages)
+
+    data = read_file_bytes(file)
+    ranges = page_ranges(page_count, workers)
+    pool = get_process_pool(workers)
+    futures = [pool.submit(_extract_page_range, data, start, stop)
+               for start, stop in ranges]
+    return "".join(future.result() for future in futures)
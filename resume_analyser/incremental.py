@@ -0,0 +1,153 @@
+"""
+Incremental re-scoring of one resume against an edited job description.
+
+In the app the resume stays the same while the job description is edited
+again and again. ``ResumeState`` splits the analysis into the resume side,
+worked out once per resume and kept (the text, its term counts, its TF-IDF
+vector for the corpus model, its section split, its suggestions and
+videos), and
+the job description side: an edit only tokenises the job description,
+builds its vector and takes one sparse dot product.
+
+Scoring uses the pure-NumPy engine in ``resume_analyser.tfidf``, which gives
+the same scores as the scikit-learn backend.
+"""
+import functools
+
+from resume_analyser.backends import as_idf_table, explain_terms
+from resume_analyser.engine import generate_key_points
+from resume_analyser.metrics import stage
+from resume_analyser.recommendations import recommend_videos
+from resume_analyser.rules import get_rules
+from resume_analyser.sections import sectioned_resume
+from resume_analyser.tfidf import (
+    IdfTable,
+    sparse_dot,
+    term_names,
+    token_counts,
+    unscored_terms,
+)
+
+
+class ResumeState:
+    """
+    The job-description-independent analysis of a resume.
+
+    Args:
+        text (str): The extracted resume text.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.counts = token_counts(text)
+        self._suggestions = None
+        self._vectors = {}
+        self._last_score = None
+
+    def _suggestions_for_rules(self):
+        # Worked out on first use and again after the rules are reloaded
+        rules = get_rules()
+        suggestions = self._suggestions
+        if suggestions is None or suggestions[0] is not rules:
+            suggestions = self._suggestions = (
+                rules, generate_key_points(self.text),
+                recommend_videos(self.text, rules=rules))
+        return suggestions
+
+    @property
+    def key_points(self):
+        """list: The improvement suggestions."""
+        return self._suggestions_for_rules()[1]
+
+    @property
+    def videos(self):
+        """list: ``(suggestion, url)`` pairs; see ``recommend_videos``."""
+        return self._suggestions_for_rules()[2]
+
+    @property
+    def sectioned(self):
+        """SectionedResume: The resume split into sections."""
+        return sectioned_resume(self.text)
+
+    def vector(self, table):
+        """
+        Returns the resume's TF-IDF vector for a corpus IDF table.
+
+        It is computed once per table and kept.
+
+        Args:
+            table (IdfTable): The corpus model's IDF table.
+
+        Returns:
+            tuple: ``(positions, weights)``; see ``IdfTable.vector``.
+        """
+        entry = self._vectors.get(id(table))
+        if entry is None:
+            # The table is kept with the vector so its id stays unique
+            entry = self._vectors[id(table)] = (table, table.vector(self.counts))
+        return entry[1]
+
+    def score(self, job_description, model=None, explain=None):
+        """
+        Scores the resume against a job description.
+
+        The result for the last job description is kept, so reruns that
+        did not change it cost nothing.
+
+        Args:
+            job_description (str): The job description.
+            model (IdfTable or TfidfVectorizer, optional): The corpus model.
+                With one, only the job description is vectorised. Without
+                one, the IDF weights are fitted on the two documents from
+                their kept term counts, as ``rank_resumes`` fits them.
+            explain (int, optional): If given, also explains the score; see
+                ``rank_resumes``.
+
+        Returns:
+            float: The cosine similarity, or a tuple of it and the
+            explanation when ``explain`` is given.
+        """
+        table = as_idf_table(model)
+        key = (job_description, id(table), explain)
+        # Read once: sessions share this object and may replace it meanwhile
+        last = self._last_score
+        if last is not None and last[0] == key:
+            return last[1]
+
+        with stage("ranking", documents=2, incremental=True) as info:
+            job_counts = token_counts(job_description)
+            if table is None:
+                fitted = IdfTable.from_counts([job_counts, self.counts])
+                resume_vector = fitted.vector(self.counts)
+            else:
+                fitted = table
+                resume_vector = self.vector(table)
+            info["vocabulary_size"] = len(fitted)
+            query = fitted.vector(job_counts)
+            result = sparse_dot(query, resume_vector)
+
+        if explain is not None:
+            result = (result, explain_terms(
+                term_names(job_description, query[0], fitted),
+                dict(zip(query[0].tolist(), query[1].tolist())),
+                dict(zip(resume_vector[0].tolist(), resume_vector[1].tolist())),
+                explain,
+                [term for i, term in unscored_terms(job_description, fitted).items()
+                 if i not in self.counts]))
+        # The table is kept with the result so its id stays unique
+        self._last_score = (key, result, table)
+        return result
+
+
+@functools.lru_cache(maxsize=64)
+def resume_state(text):
+    """
+    Returns the ``ResumeState`` for a text, analysing it once per process.
+
+    Args:
+        text (str): The extracted resume text.
+
+    Returns:
+        ResumeState: The resume-side analysis, with its cached results.
+    """
+    return ResumeState(text)
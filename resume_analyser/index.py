@@ -0,0 +1,245 @@
+"""
+Persistent inverted index over a stored resume corpus.
+
+Resumes are extracted and vectorised once when they are added. Their TF-IDF
+weights are stored term-major (one CSC matrix per segment), which is an
+inverted index: column ``t`` holds the postings, i.e. the ids and weights of
+the resumes containing term ``t``. A job description query only reads the
+postings of its own terms, so its cost follows the number of query terms and
+their postings rather than the size of the corpus.
+
+New resumes are written as a new segment, so adding to the index never
+rewrites the existing data; ``compact`` merges the segments when they pile
+up. Segment files are written before the manifest that lists them, and the
+manifest is replaced atomically, so an interrupted write never leaves a
+half-updated index.
+
+Layout of an index directory::
+
+    vectorizer.joblib     the fitted TF-IDF vectorizer
+    manifest.json         live segment files and resume metadata
+    segment-00000.npz     postings of the first batch of resumes
+    segment-00001.npz     ...
+"""
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+
+from resume_analyser.dedup import link_duplicates
+from resume_analyser.engine import (
+    extract_text_from_pdf,
+    list_resume_files,
+    top_k_scores,
+    vectorize_documents,
+)
+from resume_analyser.pdf_cache import file_digest
+
+VECTORIZER_FILE = "vectorizer.joblib"
+MANIFEST_FILE = "manifest.json"
+
+
+class ResumeIndex:
+    """
+    An on-disk inverted index of resumes.
+
+    Args:
+        path (str): The index directory. An existing index there is opened;
+            a new one is created there when resumes are first added.
+        model (TfidfVectorizer, optional): The fitted vectorizer to index
+            with, typically the corpus model. A new index without one fits
+            its own vectorizer on the first resumes added.
+        create (bool): Whether a missing directory starts a new index. If
+            False, e.g. when opening an index to search it, a missing
+            directory raises ``FileNotFoundError``.
+    """
+
+    def __init__(self, path, model=None, create=True):
+        self.path = path
+        if not create and not os.path.isdir(path):
+            raise FileNotFoundError(f"No resume index at {path}")
+
+        vectorizer_path = os.path.join(path, VECTORIZER_FILE)
+        if os.path.exists(vectorizer_path):
+            self.vectorizer = joblib.load(vectorizer_path)
+        else:
+            # Saved with the first resumes added
+            self.vectorizer = model
+
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as handle:
+                manifest = json.load(handle)
+        else:
+            manifest = {"segments": [], "next_segment": 0, "documents": []}
+        self.documents = manifest["documents"]
+        self.segment_files = manifest["segments"]
+        self.next_segment = manifest["next_segment"]
+
+        # (first document id, CSC postings) per segment
+        self.segments = []
+        offset = 0
+        for name in self.segment_files:
+            postings = sp.load_npz(os.path.join(path, name)).tocsc()
+            self.segments.append((offset, postings))
+            offset += postings.shape[0]
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _write_manifest(self):
+        manifest = {"segments": self.segment_files,
+                    "next_segment": self.next_segment,
+                    "documents": self.documents}
+        tmp_path = os.path.join(self.path, MANIFEST_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle)
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST_FILE))
+
+    def _write_segment(self, postings):
+        name = f"segment-{self.next_segment:05d}.npz"
+        self.next_segment += 1
+        sp.save_npz(os.path.join(self.path, name), postings.tocsc())
+        return name
+
+    def add_texts(self, texts, metadata=None):
+        """
+        Vectorises resume texts and appends them to the index as a segment.
+
+        Args:
+            texts (list): The resume texts.
+            metadata (list, optional): One dict per text stored alongside it,
+                e.g. ``file_name`` and ``digest``.
+
+        Returns:
+            list: The document ids assigned to the texts.
+        """
+        if not texts:
+            return []
+        if metadata is None:
+            metadata = [{} for _ in texts]
+
+        if self.vectorizer is None:
+            self.vectorizer, vectors = vectorize_documents(texts)
+        else:
+            _, vectors = vectorize_documents(texts, self.vectorizer)
+        os.makedirs(self.path, exist_ok=True)
+        vectorizer_path = os.path.join(self.path, VECTORIZER_FILE)
+        if not os.path.exists(vectorizer_path):
+            joblib.dump(self.vectorizer, vectorizer_path)
+
+        first_id = len(self.documents)
+        postings = vectors.tocsc()
+        self.segment_files.append(self._write_segment(postings))
+        self.segments.append((first_id, postings))
+
+        ids = list(range(first_id, first_id + len(texts)))
+        for doc_id, meta in zip(ids, metadata):
+            self.documents.append(dict(meta, id=doc_id))
+        self._write_manifest()
+        return ids
+
+    def add_resumes(self, resumes, cache=None, dedup=None):
+        """
+        Extracts PDF resumes and adds them to the index.
+
+        Resumes whose content hash is already indexed are skipped.
+
+        Args:
+            resumes (str or list): A directory of PDF resumes, or a list of
+                paths or uploaded file objects.
+            cache (TextCache, optional): Cache for the extracted text.
+            dedup (Deduplicator, optional): Drops near-duplicates of resumes
+                it has seen, keyed by content hash; each dropped resume is
+                listed under ``duplicates`` in its original's metadata.
+
+        Returns:
+            list: The document ids of the newly added resumes.
+        """
+        if isinstance(resumes, (str, os.PathLike)):
+            resumes = list_resume_files(resumes)
+
+        known = {document.get("digest") for document in self.documents}
+        texts, metadata = [], []
+        duplicates = {}
+        for file in resumes:
+            digest = file_digest(file)
+            if digest in known:
+                continue
+            known.add(digest)
+            text = extract_text_from_pdf(file, cache)
+            name = getattr(file, "name", file)
+            meta = {"file_name": os.path.basename(str(name)), "digest": digest}
+            original = dedup.check(digest, text) if dedup is not None else None
+            if original is not None:
+                duplicates.setdefault(original, []).append(meta)
+                continue
+            texts.append(text)
+            metadata.append(meta)
+
+        start = time.perf_counter()
+        ids = self.add_texts(texts, metadata)
+        if dedup is not None:
+            dedup.processing_seconds += time.perf_counter() - start
+        # Without stored resumes there is nothing to link, nor to write to
+        if duplicates and self.documents:
+            link_duplicates(self.documents, duplicates)
+            self._write_manifest()
+        return ids
+
+    def search(self, job_description, top_k=10):
+        """
+        Finds the resumes most similar to a job description.
+
+        Only the postings of the job description's terms are read. Rows are
+        L2-normalised, so summing the products of the query and posting
+        weights gives the cosine similarity.
+
+        Args:
+            job_description (str): The job description.
+            top_k (int): Number of results to return.
+
+        Returns:
+            list: Document metadata dicts with a ``score`` key, best first.
+            Resumes sharing no term with the job description are not
+            returned.
+        """
+        if self.vectorizer is None or not self.segments:
+            return []
+
+        _, query = vectorize_documents([job_description], self.vectorizer)
+        doc_ids, contributions = [], []
+        for offset, postings in self.segments:
+            for term, weight in zip(query.indices, query.data):
+                start, end = postings.indptr[term], postings.indptr[term + 1]
+                if start == end:
+                    continue
+                doc_ids.append(postings.indices[start:end] + offset)
+                contributions.append(postings.data[start:end] * weight)
+
+        if not doc_ids:
+            return []
+        candidates, inverse = np.unique(np.concatenate(doc_ids),
+                                        return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(contributions))
+
+        best, best_scores = top_k_scores(scores, top_k)
+        return [dict(self.documents[candidates[i]], score=float(score))
+                for i, score in zip(best, best_scores)]
+
+    def compact(self):
+        """
+        Merges all segments into one.
+        """
+        if len(self.segments) <= 1:
+            return
+        merged = sp.vstack([postings for _, postings in self.segments]).tocsc()
+        old_files = self.segment_files
+        self.segment_files = [self._write_segment(merged)]
+        self.segments = [(0, merged)]
+        self._write_manifest()
+        for name in old_files:
+            os.remove(os.path.join(self.path, name))
@@ -0,0 +1,81 @@
+"""
+Single-pass keyword matcher for resume suggestions.
+
+The phrase -> suggestion rules live in a data file (see
+``resume_analyser.rules``) and are compiled at load into a single
+trie-shaped regular expression, so a resume is lowercased once and scanned
+once no matter how many rules there are.
+"""
+from resume_analyser.rules import get_rules
+
+
+def keyword_rules(rules=None):
+    """
+    Lists the phrase -> suggestion pairs of the current rules.
+
+    Args:
+        rules (RuleSet, optional): The rules; defaults to ``get_rules()``,
+            so the pairs follow reloads of the rules file.
+
+    Returns:
+        tuple: ``(phrase, suggestion)`` pairs in rule priority order.
+    """
+    if rules is None:
+        rules = get_rules()
+    return tuple((phrase, rule.suggestion)
+                 for rule in rules.rules for phrase in rule.phrases)
+
+
+def match_keywords(resume_text):
+    """
+    Finds every rule phrase in the resume in a single pass.
+
+    Args:
+        resume_text (str): The text of the resume.
+
+    Returns:
+        dict: Maps each matched phrase to the sorted list of character
+        offsets where it occurs in the text.
+    """
+    return get_rules().match(resume_text)
+
+
+def match_rules(resume_text, rules=None):
+    """
+    Finds the rules triggered by a resume.
+
+    Args:
+        resume_text (str): The text of the resume.
+        rules (RuleSet, optional): The rules; defaults to ``get_rules()``.
+
+    Returns:
+        list: ``(rule, phrase, offsets)`` tuples from the highest priority
+        down, one for each rule with a phrase in the resume; ``phrase`` is
+        the rule's first phrase that occurs.
+    """
+    if rules is None:
+        rules = get_rules()
+    matches = rules.match(resume_text)
+    # Only the rules of the matched phrases are visited
+    triggered = {rule.id: rule for phrase in matches
+                 for rule in rules.rules_by_phrase[phrase]}
+    result = []
+    for rule in sorted(triggered.values(), key=lambda rule: rules.rank[rule.id]):
+        phrase = next(phrase for phrase in rule.phrases if phrase in matches)
+        result.append((rule, phrase, matches[phrase]))
+    return result
+
+
+def match_key_points(resume_text):
+    """
+    Matches the suggestion rules against the resume.
+
+    Args:
+        resume_text (str): The text of the resume.
+
+    Returns:
+        list: ``(suggestion, phrase, offsets)`` tuples in rule priority
+        order, one for each rule whose phrase occurs in the resume.
+    """
+    return [(rule.suggestion, phrase, offsets)
+            for rule, phrase, offsets in match_rules(resume_text)]
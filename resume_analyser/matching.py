@@ -0,0 +1,110 @@
+"""
+Many-to-many matching of job descriptions against resumes.
+
+Scoring J job descriptions against R resumes one job at a time refits the
+vectorizer J times. ``MatchMatrix`` vectorises all J + R documents once and
+computes the J x R cosine similarities as a sparse matrix product. The
+product is taken over blocks of resumes, so the intermediate result for
+one block is the largest thing held at once, and the per-job top-k and the
+per-resume best job are reduced block by block without ever materialising
+the full matrix.
+"""
+import numpy as np
+
+from resume_analyser.engine import top_k_scores, vectorize_documents
+from resume_analyser.metrics import stage
+
+DEFAULT_BLOCK_SIZE = 2048
+
+
+class MatchMatrix:
+    """
+    Cosine similarities between a set of jobs and a set of resumes.
+
+    Args:
+        job_descriptions (list): The J job description texts.
+        resumes (list): The R resume texts.
+        model (TfidfVectorizer, optional): A pre-fitted corpus model. Without
+            one, a vectorizer is fitted on all the jobs and resumes together.
+        block_size (int): Resumes scored per block; bounds peak memory to
+            about ``J * block_size`` scores.
+    """
+
+    def __init__(self, job_descriptions, resumes, model=None,
+                 block_size=DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        n_jobs = len(job_descriptions)
+        with stage("matching", documents=n_jobs + len(resumes)) as info:
+            self.vectorizer, vectors = vectorize_documents(
+                list(job_descriptions) + list(resumes), model)
+            info["vocabulary_size"] = vectors.shape[1]
+        self.job_vectors = vectors[:n_jobs]
+        self.resume_vectors = vectors[n_jobs:]
+        self.shape = (n_jobs, len(resumes))
+
+    def blocks(self):
+        """
+        Computes the similarities one block of resumes at a time.
+
+        Yields:
+            tuple: ``(first resume index, scores)`` where ``scores`` is a
+            dense J x block array.
+        """
+        job_vectors_t = self.job_vectors.T.tocsc()
+        for start in range(0, self.shape[1], self.block_size):
+            block = self.resume_vectors[start:start + self.block_size]
+            yield start, (block @ job_vectors_t).T.toarray()
+
+    def scores(self):
+        """
+        Returns the full J x R similarity matrix.
+
+        Returns:
+            numpy.ndarray: ``scores[j, r]`` is the similarity of job ``j``
+            and resume ``r``.
+        """
+        matrix = np.empty(self.shape)
+        for start, block in self.blocks():
+            matrix[:, start:start + block.shape[1]] = block
+        return matrix
+
+    def top_resumes(self, k=10):
+        """
+        Finds the k best resumes for every job.
+
+        Args:
+            k (int): Resumes per job.
+
+        Returns:
+            list: One ``(indices, scores)`` pair per job, sorted from best
+            to worst.
+        """
+        best = [(np.array([], dtype=np.intp), np.array([]))
+                for _ in range(self.shape[0])]
+        for start, block in self.blocks():
+            for job, row in enumerate(block):
+                indices, scores = top_k_scores(row, k)
+                kept_indices, kept_scores = best[job]
+                indices = np.concatenate([kept_indices, indices + start])
+                scores = np.concatenate([kept_scores, scores])
+                order, scores = top_k_scores(scores, k)
+                best[job] = (indices[order], scores)
+        return best
+
+    def best_jobs(self):
+        """
+        Finds the best-matching job for every resume.
+
+        Returns:
+            tuple: ``(jobs, scores)`` arrays of length R with the index and
+            similarity of each resume's best job.
+        """
+        jobs = np.zeros(self.shape[1], dtype=np.intp)
+        scores = np.zeros(self.shape[1])
+        if not self.shape[0]:
+            return jobs, scores
+        for start, block in self.blocks():
+            stop = start + block.shape[1]
+            jobs[start:stop] = block.argmax(axis=0)
+            scores[start:stop] = block.max(axis=0)
+        return jobs, scores
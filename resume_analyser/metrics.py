@@ -0,0 +1,199 @@
+"""
+Per-stage latency instrumentation.
+
+The hot paths (PDF extraction, ranking, suggestion generation and, in the
+app, video rendering) run inside ``stage(...)`` blocks that record their
+duration along with stage details such as page count, text length,
+vocabulary size and cache hits. The data is kept in a process-wide registry
+rendered in the Prometheus text format (served at ``/metrics`` by the HTTP
+API) and, when ``RESUME_ANALYSER_METRICS_LOG`` is set, appended as one JSON
+line per stage to a rotating log file.
+
+``profile_call`` captures a cProfile (or pyinstrument) profile of a single
+call, for switching profiling on for one request.
+"""
+import cProfile
+import io
+import json
+import logging
+import logging.handlers
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Stage fields exported as Prometheus metrics: field -> (metric, type, help)
+FIELD_METRICS = {
+    "pages": ("resume_analyser_pages_total", "counter",
+              "PDF pages extracted"),
+    "text_length": ("resume_analyser_text_chars_total", "counter",
+                    "Characters of resume text processed"),
+    "documents": ("resume_analyser_documents_total", "counter",
+                  "Documents vectorised"),
+    "vocabulary_size": ("resume_analyser_vocabulary_size", "gauge",
+                        "Vocabulary size of the last vectorisation"),
+}
+
+METRICS_LOG_PATH = os.environ.get("RESUME_ANALYSER_METRICS_LOG")
+
+_event_log = logging.getLogger("resume_analyser.metrics")
+if METRICS_LOG_PATH:
+    _handler = logging.handlers.RotatingFileHandler(
+        METRICS_LOG_PATH, maxBytes=10 * 1024 * 1024, backupCount=5)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _event_log.addHandler(_handler)
+    _event_log.setLevel(logging.INFO)
+    _event_log.propagate = False
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of stage latencies and stage field totals.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._fields = {}
+        self._cache_events = {}
+
+    def record(self, stage, seconds, fields):
+        """
+        Records one completed stage.
+
+        Args:
+            stage (str): The stage name.
+            seconds (float): How long it took.
+            fields (dict): Stage details; the ones in ``FIELD_METRICS`` and
+                ``cache_hit`` are exported.
+        """
+        with self._lock:
+            buckets, total, count = self._histograms.get(
+                stage, ([0] * len(BUCKETS), 0.0, 0))
+            buckets = [n + (seconds <= bound) for n, bound in zip(buckets, BUCKETS)]
+            self._histograms[stage] = (buckets, total + seconds, count + 1)
+
+            for field, value in fields.items():
+                if field in FIELD_METRICS and value is not None:
+                    _, kind, _ = FIELD_METRICS[field]
+                    key = (field, stage)
+                    if kind == "counter":
+                        self._fields[key] = self._fields.get(key, 0) + value
+                    else:
+                        self._fields[key] = value
+
+            if fields.get("cache_hit") is not None:
+                result = "hit" if fields["cache_hit"] else "miss"
+                key = (stage, result)
+                self._cache_events[key] = self._cache_events.get(key, 0) + 1
+
+    def render_prometheus(self):
+        """
+        Renders the registry in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics page.
+        """
+        lines = [
+            "# HELP resume_analyser_stage_seconds Time spent per pipeline stage",
+            "# TYPE resume_analyser_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, (buckets, total, count) in sorted(self._histograms.items()):
+                for bound, n in zip(BUCKETS, buckets):
+                    lines.append(f'resume_analyser_stage_seconds_bucket'
+                                 f'{{stage="{stage}",le="{bound}"}} {n}')
+                lines.append(f'resume_analyser_stage_seconds_bucket'
+                             f'{{stage="{stage}",le="+Inf"}} {count}')
+                lines.append(f'resume_analyser_stage_seconds_sum{{stage="{stage}"}} {total}')
+                lines.append(f'resume_analyser_stage_seconds_count{{stage="{stage}"}} {count}')
+
+            for field, (metric, kind, help_text) in FIELD_METRICS.items():
+                values = sorted((stage, value) for (name, stage), value
+                                in self._fields.items() if name == field)
+                if not values:
+                    continue
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {kind}")
+                for stage, value in values:
+                    lines.append(f'{metric}{{stage="{stage}"}} {value}')
+
+            if self._cache_events:
+                lines.append("# HELP resume_analyser_cache_requests_total "
+                             "Text cache lookups by result")
+                lines.append("# TYPE resume_analyser_cache_requests_total counter")
+                for (stage, result), n in sorted(self._cache_events.items()):
+                    lines.append(f'resume_analyser_cache_requests_total'
+                                 f'{{stage="{stage}",result="{result}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Clears everything recorded so far."""
+        with self._lock:
+            self._histograms.clear()
+            self._fields.clear()
+            self._cache_events.clear()
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def stage(name, **fields):
+    """
+    Times a pipeline stage.
+
+    The block receives a dict it can add stage details to; they are recorded
+    together with the duration when the block exits.
+
+    Args:
+        name (str): The stage name.
+        **fields: Initial stage details.
+
+    Yields:
+        dict: The stage details, to be filled in by the block.
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        seconds = time.perf_counter() - start
+        registry.record(name, seconds, fields)
+        if _event_log.isEnabledFor(logging.INFO):
+            _event_log.info(json.dumps(dict(
+                fields, stage=name, seconds=round(seconds, 6), time=time.time())))
+
+
+def profile_call(func, *args, profiler="cprofile", **kwargs):
+    """
+    Calls a function under a profiler.
+
+    Args:
+        func (callable): The function to profile.
+        *args: Positional arguments for ``func``.
+        profiler (str): ``"cprofile"``, or ``"pyinstrument"`` if that
+            package is installed.
+        **kwargs: Keyword arguments for ``func``.
+
+    Returns:
+        tuple: ``(result, report)`` where ``report`` is the profile as text.
+    """
+    if profiler == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profile = Profiler()
+        profile.start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profile.stop()
+        return result, profile.output_text()
+
+    profile = cProfile.Profile()
+    result = profile.runcall(func, *args, **kwargs)
+    report = io.StringIO()
+    pstats.Stats(profile, stream=report).sort_stats("cumulative").print_stats(30)
+    return result, report.getvalue()
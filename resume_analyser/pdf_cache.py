@@ -0,0 +1,186 @@
+"""
+Content-addressed cache for extracted resume text.
+
+Extracted text is stored under the SHA-256 of the PDF's bytes, so reruns
+and re-uploads of the same file skip PDF parsing entirely. The cache has a
+size-bounded in-memory LRU tier and an optional on-disk tier that survives
+restarts.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_CHARS = 64 * 1024 * 1024
+
+
+def read_file_bytes(file):
+    """
+    Reads the whole content of a PDF.
+
+    Args:
+        file (str or file-like): A path, or a file object such as a
+            Streamlit upload. The position of file objects is restored
+            after reading.
+
+    Returns:
+        bytes: The file content.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as handle:
+            return handle.read()
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    position = file.tell()
+    file.seek(0)
+    data = file.read()
+    file.seek(position)
+    return data
+
+
+def file_digest(file):
+    """
+    Computes the SHA-256 hex digest of a PDF's bytes.
+
+    Args:
+        file (str or file-like): A path, or a file object such as a
+            Streamlit upload.
+
+    Returns:
+        str: The hex digest.
+    """
+    return hashlib.sha256(read_file_bytes(file)).hexdigest()
+
+
+class TextCache:
+    """
+    Two-tier cache of extracted text keyed by file digest.
+
+    Args:
+        max_chars (int): Upper bound on the total number of characters held
+            in memory; least recently used entries are evicted past it.
+        cache_dir (str, optional): Directory for the on-disk tier. Disabled
+            when None.
+    """
+
+    def __init__(self, max_chars=DEFAULT_MAX_CHARS, cache_dir=None):
+        self.max_chars = max_chars
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".txt")
+
+    def _remember(self, key, text):
+        # Caller holds the lock.
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        size = len(text)
+        if size > self.max_chars:
+            return
+        self._entries[key] = text
+        self._size += size
+        while self._size > self.max_chars:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def get(self, key):
+        """
+        Looks up the text for a digest.
+
+        Args:
+            key (str): The file digest.
+
+        Returns:
+            str: The cached text, or None on a miss.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key]
+
+        if self.cache_dir:
+            try:
+                with open(self._disk_path(key), encoding="utf-8") as handle:
+                    text = handle.read()
+            except FileNotFoundError:
+                pass
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, text)
+                return text
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, text):
+        """
+        Stores the text for a digest in memory and, if enabled, on disk.
+
+        Args:
+            key (str): The file digest.
+            text (str): The extracted text.
+        """
+        with self._lock:
+            self._remember(key, text)
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a
+            # partial entry.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(text)
+            os.replace(tmp_path, path)
+
+    def clear(self):
+        """Drops the in-memory tier and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.memory_hits = self.disk_hits = 0
+            self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns the hit/miss counters.
+
+        Returns:
+            dict: Hit, miss and eviction counts plus the memory tier size.
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "memory_chars": self._size,
+            }
+
+
+# Process-wide cache used by the app; set RESUME_ANALYSER_CACHE_DIR to
+# enable the on-disk tier.
+default_text_cache = TextCache(
+    max_chars=int(os.environ.get("RESUME_ANALYSER_CACHE_CHARS",
+                                 DEFAULT_MAX_CHARS)),
+    cache_dir=os.environ.get("RESUME_ANALYSER_CACHE_DIR") or None,
+)
@@ -0,0 +1,54 @@
+"""
+Video recommendations for resume suggestions.
+
+The videos are part of the suggestion rules (see ``resume_analyser.rules``):
+a resume is matched against the rules and each triggered rule brings its
+own videos, so a suggestion can be reworded in the rules file without
+losing them.
+"""
+from resume_analyser.keywords import match_rules
+from resume_analyser.rules import get_rules
+
+
+def video_recommendations(rules=None):
+    """
+    Lists the videos of every rule.
+
+    Args:
+        rules (RuleSet, optional): The rules; defaults to ``get_rules()``,
+            so the index follows reloads of the rules file.
+
+    Returns:
+        dict: Rule id -> the rule's video URLs.
+    """
+    if rules is None:
+        rules = get_rules()
+    return {rule_id: rule.videos for rule_id, rule in rules.by_id.items()}
+
+# Function to pick the videos for a resume
+
+
+def recommend_videos(resume_text, limit=None, rules=None):
+    """
+    Looks up the recommended videos for the rules a resume triggers.
+
+    Args:
+        resume_text (str): The text of the resume.
+        limit (int, optional): Maximum number of videos to return.
+        rules (RuleSet, optional): The rules; defaults to ``get_rules()``.
+
+    Returns:
+        list: ``(suggestion, url)`` pairs in rule priority order, with each
+        rule's videos in rules file order.
+    """
+    videos = []
+    seen = set()
+    for rule, _, _ in match_rules(resume_text, rules):
+        for url in rule.videos:
+            # Rules sharing a suggestion may also share its videos
+            if (rule.suggestion, url) not in seen:
+                seen.add((rule.suggestion, url))
+                videos.append((rule.suggestion, url))
+    if limit is not None:
+        videos = videos[:limit]
+    return videos
@@ -0,0 +1,302 @@
+"""
+Suggestion and video rules, loaded from a data file.
+
+Each rule ties one or more phrases to a suggestion and the videos that help
+act on it::
+
+    {"rules": [
+        {"id": "android-developer",
+         "phrases": ["android developer"],
+         "suggestion": "Add Some Android Course Certificates to your Resume.",
+         "videos": ["https://youtu.be/HyU4vkZ2NB8"],
+         "priority": 10}
+    ]}
+
+``priority`` is optional (default 0); matched rules are reported from the
+highest priority down, and in file order within a priority. The file is
+JSON, or YAML when its name ends in ``.yaml``/``.yml`` and PyYAML is
+installed. ``rules.json`` next to this module is the default; set
+``RESUME_ANALYSER_RULES`` to use another file.
+
+A loaded file is compiled into a ``RuleSet``: all phrases go into one
+trie-shaped regular expression, so a resume is scanned once however many
+rules there are, and rules are indexed by id and by phrase, so going from a
+matched phrase to its rules and their videos does not depend on the number
+of rules.
+``get_rules`` reloads the file when it changes on disk, so rules can be
+edited without a restart; a file that fails to load is logged and the
+previous rules stay in use.
+"""
+import json
+import logging
+import os
+import re
+import threading
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "rules.json")
+RULES_PATH = os.environ.get("RESUME_ANALYSER_RULES", DEFAULT_RULES_PATH)
+
+logger = logging.getLogger(__name__)
+
+
+class RuleError(ValueError):
+    """A rules file that is malformed or inconsistent."""
+
+
+class Rule:
+    """
+    One suggestion rule.
+
+    Args:
+        rule_id (str): The rule's unique id.
+        phrases (tuple): Lowercase phrases that trigger the rule.
+        suggestion (str): The suggestion shown when it is triggered.
+        videos (tuple): URLs of the videos recommended with it.
+        priority (int): Higher priorities are reported first.
+    """
+
+    __slots__ = ("id", "phrases", "suggestion", "videos", "priority")
+
+    def __init__(self, rule_id, phrases, suggestion, videos=(), priority=0):
+        self.id = rule_id
+        self.phrases = tuple(phrases)
+        self.suggestion = suggestion
+        self.videos = tuple(videos)
+        self.priority = priority
+
+    def __repr__(self):
+        return f"Rule({self.id!r})"
+
+
+def _trie_pattern(phrases):
+    """
+    Builds a regular expression for a set of phrases from a prefix trie.
+
+    Phrases sharing a prefix share one branch of the expression, so the
+    regex engine tests each character once instead of once per phrase.
+    Longer continuations are tried before a phrase that ends at the same
+    node, so the longest phrase at a position wins.
+
+    Args:
+        phrases (iterable): The literal phrases.
+
+    Returns:
+        str: The regular expression source.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else (
+            "(?:" + "|".join(branches) + ")")
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+def _compile(phrases):
+    """
+    Compiles phrases into one overlapping-match pattern.
+
+    The pattern is a lookahead around the phrase trie, so it reports the
+    longest phrase starting at every position. Shorter phrases occurring
+    inside a longer one (e.g. "software" inside "software engineer") are
+    recovered from a precomputed containment table.
+
+    Args:
+        phrases (iterable): The phrases.
+
+    Returns:
+        tuple: ``(pattern, contained)`` where ``contained`` maps each phrase
+        to ``(other_phrase, offset)`` pairs for every occurrence of another
+        phrase inside it.
+    """
+    phrases = sorted(set(phrases))
+    pattern = re.compile("(?=(" + _trie_pattern(phrases) + "))")
+
+    # Every substring of each phrase is looked up, rather than every other
+    # phrase searched for, so compiling stays fast for large rule sets
+    known = set(phrases)
+    contained = {}
+    for outer in phrases:
+        contained[outer] = [
+            (outer[start:end], start)
+            for start in range(len(outer))
+            for end in range(start + 1, len(outer) + 1)
+            if end - start < len(outer) and outer[start:end] in known
+        ]
+    return pattern, contained
+
+
+class RuleSet:
+    """
+    A compiled set of rules.
+
+    Args:
+        rules (list): The ``Rule`` objects, in file order.
+
+    Attributes:
+        rules (tuple): The rules from the highest priority down.
+        rank (dict): Rule id -> position in ``rules``.
+        by_id (dict): Rule id -> rule.
+        rules_by_phrase (dict): Phrase -> the rules it triggers, in
+            ``rules`` order.
+    """
+
+    def __init__(self, rules):
+        # sorted() is stable, so file order is kept within a priority
+        self.rules = tuple(sorted(rules, key=lambda rule: -rule.priority))
+        self.rank = {rule.id: rank for rank, rule in enumerate(self.rules)}
+        self.by_id = {}
+        self.rules_by_phrase = {}
+        for rule in self.rules:
+            if rule.id in self.by_id:
+                raise RuleError(f"Duplicate rule id {rule.id!r}")
+            self.by_id[rule.id] = rule
+            for phrase in rule.phrases:
+                self.rules_by_phrase.setdefault(phrase, []).append(rule)
+        self.pattern, self.contained = _compile(self.rules_by_phrase)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def match(self, text):
+        """
+        Finds every rule phrase in a text in a single pass.
+
+        Args:
+            text (str): The text, e.g. a resume.
+
+        Returns:
+            dict: Maps each matched phrase to the sorted list of character
+            offsets where it occurs in the text.
+        """
+        matches = {}
+        if not self.rules_by_phrase:
+            return matches
+        for match in self.pattern.finditer(text.lower()):
+            phrase = match.group(1)
+            start = match.start()
+            matches.setdefault(phrase, []).append(start)
+            for inner, offset in self.contained[phrase]:
+                matches.setdefault(inner, []).append(start + offset)
+        return {phrase: sorted(set(offsets)) for phrase, offsets in matches.items()}
+
+
+def _parse(rule, position):
+    if not isinstance(rule, dict):
+        raise RuleError(f"Rule {position} is not a mapping")
+    missing = {"id", "phrases", "suggestion"} - set(rule)
+    if missing:
+        raise RuleError(f"Rule {rule.get('id', position)!r} is missing "
+                        f"{', '.join(sorted(missing))}")
+    phrases = rule["phrases"]
+    if isinstance(phrases, str):
+        phrases = [phrases]
+    phrases = [phrase.lower() for phrase in phrases if phrase]
+    if not phrases:
+        raise RuleError(f"Rule {rule['id']!r} has no phrases")
+    videos = rule.get("videos", [])
+    if isinstance(videos, str):
+        videos = [videos]
+    try:
+        priority = int(rule.get("priority", 0))
+    except (TypeError, ValueError):
+        raise RuleError(f"Rule {rule['id']!r} has a non-integer priority") from None
+    return Rule(str(rule["id"]), phrases, rule["suggestion"], videos, priority)
+
+
+def load_rules(path=RULES_PATH):
+    """
+    Reads and compiles a rules file.
+
+    Args:
+        path (str): A ``.json``, ``.yaml`` or ``.yml`` rules file.
+
+    Returns:
+        RuleSet: The compiled rules.
+
+    Raises:
+        RuleError: If the file is malformed.
+    """
+    with open(path, encoding="utf-8") as handle:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuleError("Reading YAML rules needs PyYAML "
+                                "(pip install pyyaml)") from None
+            try:
+                data = yaml.safe_load(handle)
+            except yaml.YAMLError as error:
+                raise RuleError(f"Invalid YAML in {path}: {error}") from None
+        else:
+            try:
+                data = json.load(handle)
+            except json.JSONDecodeError as error:
+                raise RuleError(f"Invalid JSON in {path}: {error}") from None
+
+    if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+        raise RuleError(f"{path} needs a top-level 'rules' list")
+    return RuleSet([_parse(rule, i) for i, rule in enumerate(data["rules"])])
+
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def get_rules(path=None):
+    """
+    Returns the current rules, reloading the file if it has changed.
+
+    Each call costs one ``os.stat``; the file is only read and compiled
+    again when its modification time or size changes. If the new version
+    cannot be loaded, the error is logged and the previous rules are kept.
+
+    Args:
+        path (str, optional): The rules file; defaults to ``RULES_PATH``.
+
+    Returns:
+        RuleSet: The compiled rules.
+    """
+    path = path or RULES_PATH
+    entry = _loaded.get(path)
+    try:
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        if entry is None:
+            raise
+        return entry[1]
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    with _lock:
+        entry = _loaded.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        try:
+            rules = load_rules(path)
+        except (OSError, RuleError) as error:
+            if entry is None:
+                raise
+            logger.error("Keeping the previous rules; could not reload %s: %s",
+                         path, error)
+            # Not retried until the file changes again
+            _loaded[path] = (stamp, entry[1])
+            return entry[1]
+        if entry is not None:
+            logger.info("Reloaded %d rules from %s", len(rules), path)
+        _loaded[path] = (stamp, rules)
+        return rules
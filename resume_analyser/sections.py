@@ -0,0 +1,256 @@
+"""
+Section-aware resume scoring.
+
+The extracted text is split into sections (Skills, Experience, Education,
+Projects, Certifications, and everything else) by recognising heading lines.
+Each section is vectorised on its own and scored against the job
+description, and the section scores are combined with configurable weights,
+so a skill listed under Skills can count for more than the same word in a
+hobbies line.
+
+A ``SectionedResume`` keeps its sections, their vectors for the corpus
+model and the last job description's section scores, so changing the
+weights only recombines numbers, without re-parsing or re-vectorising.
+
+Like ``resume_analyser.incremental``, scoring uses the pure-NumPy engine in
+``resume_analyser.tfidf``. It accepts either backend's form of the corpus
+model, so the sections are weighted with the same IDF table as the whole
+resume, and never imports scikit-learn. NumPy is imported on first use, so
+the app's landing page can import this module for free.
+"""
+import functools
+import re
+
+from resume_analyser.backends import as_idf_table
+
+SECTIONS = ("skills", "experience", "education", "projects", "certifications",
+            "other")
+
+DEFAULT_SECTION_WEIGHTS = {
+    "skills": 0.35,
+    "experience": 0.30,
+    "projects": 0.15,
+    "education": 0.05,
+    "certifications": 0.05,
+    "other": 0.10,
+}
+
+# Heading names per section; "other" covers headings whose content should
+# not be credited to the section before them
+_HEADINGS = {
+    "skills": r"skills?|competenc(?:y|ies)|technologies|tools",
+    "experience": r"experience|employment|employment history|work history|"
+                  r"career history",
+    "education": r"education|qualifications?|academic background",
+    "projects": r"projects?",
+    "certifications": r"certifications?|certificates?|licen[cs]es?|courses",
+    "other": r"objective|summary|profile|about me|interests|hobbies|"
+             r"languages?|language skills|awards|achievements|references|"
+             r"personal (?:details|information)|contact(?: details)?",
+}
+_QUALIFIERS = (r"technical|key|core|professional|work|relevant|academic|"
+               r"personal|educational|other|additional")
+
+_HEADING_PATTERN = re.compile(
+    r"^(?:(?:%s)\s+)*(?:%s)(?:\s+(?:details|summary|history))?\s*:?$" % (
+        _QUALIFIERS,
+        "|".join(f"(?P<{name}>{pattern})" for name, pattern in _HEADINGS.items())),
+    re.IGNORECASE)
+
+# PDF extraction sometimes glues a heading to the end of the previous line,
+# e.g. "GuidelinesEducation"
+_GLUED_HEADING = re.compile(
+    r"(?<=[a-z.,)])(Skills|Experience|Education|Projects|Certifications)$")
+
+
+def _heading_section(line):
+    """Returns the section a heading line starts, or None for other lines."""
+    line = " ".join(line.split())
+    if not line or len(line) > 40:
+        return None
+    match = _HEADING_PATTERN.match(line)
+    if match is None:
+        return None
+    # "Language skills" and similar are listed under "other", which is
+    # tried last, so the first group that matched wins
+    for name in _HEADINGS:
+        if match.group(name) is not None:
+            return name
+    return None
+
+
+def split_sections(text):
+    """
+    Splits resume text into sections using heading heuristics.
+
+    Args:
+        text (str): The extracted resume text.
+
+    Returns:
+        dict: Section name -> its text, for the sections that have any.
+        Text before the first heading, and under unrecognised headings, is
+        in ``"other"``.
+    """
+    parts = {name: [] for name in SECTIONS}
+    current = "other"
+    for line in text.splitlines():
+        section = _heading_section(line)
+        if section is None:
+            glued = _GLUED_HEADING.search(line.strip())
+            if glued is not None:
+                parts[current].append(line.strip()[:glued.start()])
+                section = glued.group(1).lower()
+        if section is not None:
+            current = section
+            continue
+        parts[current].append(line)
+
+    sections = {}
+    for name in SECTIONS:
+        section_text = "\n".join(parts[name]).strip()
+        if section_text:
+            sections[name] = section_text
+    return sections
+
+
+def combine_section_scores(scores, weights=None):
+    """
+    Combines per-section scores into one similarity.
+
+    Args:
+        scores (dict): Section name -> cosine similarity, for the sections
+            the resume has.
+        weights (dict, optional): Section name -> weight. Defaults to
+            ``DEFAULT_SECTION_WEIGHTS``. Weights are renormalised over the
+            sections present, so a resume without recognised headings
+            scores as a whole.
+
+    Returns:
+        float: The weighted average of the section scores.
+    """
+    if weights is None:
+        weights = DEFAULT_SECTION_WEIGHTS
+    total = sum(weights.get(name, 0) for name in scores)
+    if not total:
+        return 0.0
+    return sum(weights.get(name, 0) * score
+               for name, score in scores.items()) / total
+
+
+class SectionedResume:
+    """
+    A resume split into sections, with cached section vectors.
+
+    Args:
+        text (str): The extracted resume text.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.sections = split_sections(text)
+        self._counts = None
+        self._vectors = {}
+        self._last_scores = None
+
+    @property
+    def section_counts(self):
+        """list: ``token_counts`` of each section, in ``sections`` order."""
+        if self._counts is None:
+            from resume_analyser.tfidf import token_counts
+
+            self._counts = [token_counts(section)
+                            for section in self.sections.values()]
+        return self._counts
+
+    def section_vectors(self, table):
+        """
+        Returns the TF-IDF vectors of the sections for a corpus IDF table.
+
+        They are computed once per table and kept.
+
+        Args:
+            table (IdfTable): The corpus model's IDF table.
+
+        Returns:
+            list: One ``(positions, weights)`` vector per section, in
+            ``sections`` order.
+        """
+        entry = self._vectors.get(id(table))
+        if entry is None:
+            # The table is kept with its vectors so its id stays unique
+            entry = self._vectors[id(table)] = (
+                table, [table.vector(counts) for counts in self.section_counts])
+        return entry[1]
+
+    def section_scores(self, job_description, model=None):
+        """
+        Scores each section against a job description.
+
+        The scores of the last job description are kept, so reweighting
+        costs nothing.
+
+        Args:
+            job_description (str): The job description.
+            model (IdfTable or TfidfVectorizer, optional): The corpus model,
+                in the form the configured backend loads it. Without one,
+                the IDF weights are fitted on the job description and the
+                sections.
+
+        Returns:
+            dict: Section name -> cosine similarity.
+        """
+        if not self.sections:
+            return {}
+        table = as_idf_table(model)
+        key = (job_description, id(table))
+        # Read once: sessions share this object and may replace it meanwhile
+        last = self._last_scores
+        if last is not None and last[0] == key:
+            return last[1]
+
+        from resume_analyser.tfidf import IdfTable, sparse_dot, token_counts
+
+        job_counts = token_counts(job_description)
+        if table is None:
+            fitted = IdfTable.from_counts([job_counts] + self.section_counts)
+            section_vectors = [fitted.vector(counts)
+                               for counts in self.section_counts]
+        else:
+            fitted = table
+            section_vectors = self.section_vectors(table)
+        job_vector = fitted.vector(job_counts)
+
+        scores = {name: sparse_dot(job_vector, vector)
+                  for name, vector in zip(self.sections, section_vectors)}
+        self._last_scores = (key, scores)
+        return scores
+
+    def score(self, job_description, weights=None, model=None):
+        """
+        Computes the section-weighted similarity to a job description.
+
+        Args:
+            job_description (str): The job description.
+            weights (dict, optional): Section weights; see
+                ``combine_section_scores``.
+            model (IdfTable or TfidfVectorizer, optional): The corpus model.
+
+        Returns:
+            float: The weighted similarity.
+        """
+        return combine_section_scores(
+            self.section_scores(job_description, model), weights)
+
+
+@functools.lru_cache(maxsize=256)
+def sectioned_resume(text):
+    """
+    Returns the ``SectionedResume`` for a text, parsing it once per process.
+
+    Args:
+        text (str): The extracted resume text.
+
+    Returns:
+        SectionedResume: The parsed resume, with its cached vectors.
+    """
+    return SectionedResume(text)
@@ -0,0 +1,404 @@
+"""
+Streaming ingestion with bounded memory.
+
+``TfidfVectorizer`` keeps its whole vocabulary in a dict that grows with
+every new term, so fitting it over a large corpus takes memory in
+proportion to the corpus. This mode uses a ``HashingVectorizer`` instead:
+terms are hashed into a fixed number of columns, so there is no vocabulary
+to keep. Resumes are consumed from any iterable (a generator is fine) in
+fixed-size chunks; each chunk's raw term counts are written to disk and
+only a fixed-size document-frequency array stays in memory, so memory use
+is flat however many resumes pass through.
+
+IDF weights are derived from the document frequencies with the same
+smoothing as ``TfidfVectorizer``, so scores match a ``TfidfVectorizer``
+fitted on the stored resumes except where two terms share a hash column.
+They are refreshed every ``refresh_every`` chunks, if set, and always by
+``finalize``; searches use the weights of the last refresh.
+
+Every chunk's resume metadata is written next to its term counts and the
+manifest only holds settings and counters, so writing a chunk costs the
+same however large the store is, and metadata is only read back for the
+chunks a search result comes from. The document frequencies are saved
+with the IDF weights, not after every chunk, and opening a store adds in
+the chunks written since.
+
+Layout of a store directory::
+
+    manifest.json       settings, counters and live files
+    df-00001.npy        document frequency of every hashed term, as of
+                        the last refresh
+    idf-00001.npy       IDF weights as of the last refresh
+    chunk-00000.npz     raw term counts of the first chunk of resumes
+    meta-00000.jsonl    metadata of the first chunk's resumes, one per line
+    chunk-00001.npz     ...
+
+As in ``resume_analyser.index``, new files are written before the manifest
+that lists them and the manifest is replaced atomically, so an interrupted
+ingestion resumes from the last complete chunk.
+"""
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from resume_analyser.dedup import link_duplicates
+from resume_analyser.engine import (
+    extract_text_from_pdf,
+    list_resume_files,
+    sparse_cosine_scores,
+    top_k_scores,
+)
+from resume_analyser.pdf_cache import file_digest
+
+DEFAULT_N_FEATURES = 2 ** 20
+DEFAULT_CHUNK_SIZE = 256
+MANIFEST_FILE = "manifest.json"
+
+
+def _chunk_file(index):
+    return f"chunk-{index:05d}.npz"
+
+
+def _metadata_file(index):
+    return f"meta-{index:05d}.jsonl"
+
+
+def iter_chunks(items, size):
+    """
+    Groups an iterable into lists of at most ``size`` items.
+
+    Args:
+        items (iterable): The items; only one chunk is held at a time.
+        size (int): The chunk size.
+
+    Yields:
+        list: The next chunk.
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class StreamingStore:
+    """
+    An on-disk store of hashed term counts, filled in chunks.
+
+    Args:
+        path (str): The store directory. It is created if missing, and an
+            existing store there is opened, so ingestion can resume.
+        n_features (int): Number of hash columns for a new store.
+        chunk_size (int): Resumes vectorised and written at a time.
+        refresh_every (int, optional): Recompute the IDF weights after this
+            many chunks. By default they are only computed by ``finalize``.
+    """
+
+    def __init__(self, path, n_features=DEFAULT_N_FEATURES,
+                 chunk_size=DEFAULT_CHUNK_SIZE, refresh_every=None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.refresh_every = refresh_every
+        os.makedirs(path, exist_ok=True)
+
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as handle:
+                manifest = json.load(handle)
+            n_features = manifest["n_features"]
+        else:
+            manifest = {"n_features": n_features, "chunks": 0,
+                        "documents": 0, "df": None, "df_chunks": 0,
+                        "idf": None, "idf_documents": 0}
+        self.n_features = n_features
+        self.n_chunks = manifest["chunks"]
+        self.n_documents = manifest["documents"]
+        self.df_file = manifest["df"]
+        self.df_chunks = manifest["df_chunks"]
+        self.idf_file = manifest["idf"]
+        self.idf_documents = manifest["idf_documents"]
+
+        self.df = (np.load(os.path.join(path, self.df_file)) if self.df_file
+                   else np.zeros(n_features, dtype=np.int64))
+        for index in range(self.df_chunks, self.n_chunks):
+            self._count_documents(
+                sp.load_npz(os.path.join(path, _chunk_file(index))))
+        self.idf = (np.load(os.path.join(path, self.idf_file))
+                    if self.idf_file else None)
+
+        # Raw counts; the IDF weighting and normalisation happen at query time
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, alternate_sign=False, norm=None)
+        self._chunks_since_refresh = 0
+
+    def __len__(self):
+        return self.n_documents
+
+    def _write_manifest(self, replaced=()):
+        manifest = {"n_features": self.n_features,
+                    "chunks": self.n_chunks,
+                    "documents": self.n_documents,
+                    "df": self.df_file,
+                    "df_chunks": self.df_chunks,
+                    "idf": self.idf_file,
+                    "idf_documents": self.idf_documents}
+        tmp_path = os.path.join(self.path, MANIFEST_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle)
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST_FILE))
+        for name in replaced:
+            if name:
+                os.remove(os.path.join(self.path, name))
+
+    def _save_array(self, prefix, array):
+        # Named after the chunk count; a refresh without new chunks
+        # replaces the file of the same name atomically
+        name = f"{prefix}-{self.n_chunks:05d}.npy"
+        tmp_path = os.path.join(self.path, "tmp-" + name)
+        np.save(tmp_path, array)
+        os.replace(tmp_path, os.path.join(self.path, name))
+        return name
+
+    def read_metadata(self, index):
+        """
+        Reads the metadata of one chunk's resumes.
+
+        Args:
+            index (int): The chunk number.
+
+        Returns:
+            list: One dict per resume, in id order.
+        """
+        with open(os.path.join(self.path, _metadata_file(index)),
+                  encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle]
+
+    def _write_metadata(self, index, documents):
+        name = _metadata_file(index)
+        tmp_path = os.path.join(self.path, "tmp-" + name)
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            for document in documents:
+                handle.write(json.dumps(document) + "\n")
+        os.replace(tmp_path, os.path.join(self.path, name))
+
+    def _count_documents(self, counts):
+        # Duplicates are summed before a chunk is saved, so every stored
+        # (row, column) pair is one document containing the term
+        self.df += np.bincount(counts.indices, minlength=self.n_features)
+
+    def _write_chunk(self, pairs):
+        texts = [text for text, _ in pairs]
+        counts = self.vectorizer.transform(texts).tocsr()
+        counts.sum_duplicates()
+        self._count_documents(counts)
+
+        sp.save_npz(os.path.join(self.path, _chunk_file(self.n_chunks)), counts)
+        self._write_metadata(self.n_chunks, [
+            dict(meta, id=self.n_documents + offset)
+            for offset, (_, meta) in enumerate(pairs)])
+        self.n_chunks += 1
+        self.n_documents += len(pairs)
+
+        self._chunks_since_refresh += 1
+        if self.refresh_every and self._chunks_since_refresh >= self.refresh_every:
+            self._refresh_idf()
+        else:
+            self._write_manifest()
+
+    def _ingest(self, pairs):
+        added = 0
+        for chunk in iter_chunks(pairs, self.chunk_size):
+            self._write_chunk(chunk)
+            added += len(chunk)
+        return added
+
+    def ingest_texts(self, texts, metadata=None):
+        """
+        Adds resume texts to the store, one chunk at a time.
+
+        Args:
+            texts (iterable): The resume texts; may be a generator.
+            metadata (iterable, optional): One dict per text, consumed in
+                step with ``texts``.
+
+        Returns:
+            int: The number of resumes added.
+        """
+        if metadata is None:
+            metadata = itertools.repeat({})
+        return self._ingest(zip(texts, metadata))
+
+    def ingest_resumes(self, resumes, cache=None, dedup=None):
+        """
+        Extracts PDF resumes lazily and adds them to the store.
+
+        Args:
+            resumes (str or iterable): A directory of PDF resumes, or an
+                iterable of paths or uploaded file objects.
+            cache (TextCache, optional): Cache for the extracted text.
+            dedup (Deduplicator, optional): Drops near-duplicates of resumes
+                it has seen, keyed by content hash; each dropped resume is
+                listed under ``duplicates`` in its original's metadata.
+
+        Returns:
+            int: The number of resumes added.
+        """
+        if isinstance(resumes, (str, os.PathLike)):
+            resumes = list_resume_files(resumes)
+
+        duplicates = {}
+        upstream_seconds = 0.0
+
+        def extracted():
+            nonlocal upstream_seconds
+            for file in resumes:
+                start = time.perf_counter()
+                name = getattr(file, "name", file)
+                text = extract_text_from_pdf(file, cache)
+                meta = {"file_name": os.path.basename(str(name)),
+                        "digest": file_digest(file)}
+                original = (dedup.check(meta["digest"], text)
+                            if dedup is not None else None)
+                upstream_seconds += time.perf_counter() - start
+                if original is not None:
+                    duplicates.setdefault(original, []).append(meta)
+                    continue
+                yield text, meta
+
+        start = time.perf_counter()
+        added = self._ingest(extracted())
+        if dedup is not None:
+            dedup.processing_seconds += (time.perf_counter() - start
+                                         - upstream_seconds)
+        if duplicates:
+            self._link_duplicates(duplicates)
+        return added
+
+    def _link_duplicates(self, duplicates):
+        # An original can be in any chunk, of this run or an earlier one;
+        # only the metadata files holding one are rewritten
+        remaining = set(duplicates)
+        for index in range(self.n_chunks):
+            if not remaining:
+                break
+            documents = self.read_metadata(index)
+            found = remaining & {document.get("digest") for document in documents}
+            if found:
+                link_duplicates(documents,
+                                {digest: duplicates[digest] for digest in found})
+                self._write_metadata(index, documents)
+                remaining -= found
+
+    def _refresh_idf(self):
+        n_documents = self.n_documents
+        idf = np.log((1 + n_documents) / (1 + self.df)) + 1
+        # Terms no stored resume contains get no weight, as terms outside a
+        # fitted vocabulary get none; otherwise they would only inflate the
+        # norm of the query
+        idf[self.df == 0] = 0
+        self.idf = idf
+        old_df, old_idf = self.df_file, self.idf_file
+        self.df_file = self._save_array("df", self.df)
+        self.df_chunks = self.n_chunks
+        self.idf_file = self._save_array("idf", self.idf)
+        self.idf_documents = n_documents
+        self._chunks_since_refresh = 0
+        # A refresh without new chunks overwrote the files of the same name
+        self._write_manifest(replaced=[name for name in (old_df, old_idf)
+                                       if name not in (self.df_file,
+                                                       self.idf_file)])
+        return self.idf
+
+    def refresh_idf(self):
+        """
+        Recomputes the IDF weights from the current document frequencies.
+
+        Returns:
+            numpy.ndarray: The new weights.
+        """
+        return self._refresh_idf()
+
+    def finalize(self):
+        """
+        Brings the IDF weights up to date once ingestion is done.
+
+        Returns:
+            numpy.ndarray: The final weights.
+        """
+        return self.refresh_idf()
+
+    def transform(self, texts):
+        """
+        Turns texts into L2-normalised TF-IDF vectors with the store's
+        current IDF weights.
+
+        Args:
+            texts (list): The texts.
+
+        Returns:
+            scipy.sparse.csr_matrix: One row per text.
+        """
+        if self.idf is None:
+            raise RuntimeError("The store has no IDF weights yet; "
+                               "call finalize() first")
+        counts = self.vectorizer.transform(texts)
+        return normalize(counts.multiply(self.idf).tocsr())
+
+    def iter_vectors(self):
+        """
+        Reads the stored resumes back as TF-IDF vectors, a chunk at a time.
+
+        Yields:
+            tuple: ``(first document id, vectors)`` per chunk.
+        """
+        if self.idf is None:
+            raise RuntimeError("The store has no IDF weights yet; "
+                               "call finalize() first")
+        first_id = 0
+        for index in range(self.n_chunks):
+            counts = sp.load_npz(os.path.join(self.path, _chunk_file(index)))
+            yield first_id, normalize(counts.multiply(self.idf).tocsr())
+            first_id += counts.shape[0]
+
+    def search(self, job_description, top_k=10):
+        """
+        Finds the stored resumes most similar to a job description.
+
+        Chunks are scored one at a time and only the running top-k is
+        kept, so memory does not grow with the store; metadata is then read
+        for the chunks the results come from.
+
+        Args:
+            job_description (str): The job description.
+            top_k (int): Number of results to return.
+
+        Returns:
+            list: Document metadata dicts with a ``score`` key, best first.
+        """
+        query = self.transform([job_description])
+        best_ids = np.array([], dtype=np.intp)
+        best_chunks = np.array([], dtype=np.intp)
+        best_scores = np.array([], dtype=np.float64)
+        for index, (first_id, vectors) in enumerate(self.iter_vectors()):
+            indices, scores = top_k_scores(
+                sparse_cosine_scores(query, vectors), top_k)
+            ids = np.concatenate([best_ids, indices + first_id])
+            chunks = np.concatenate([best_chunks, np.full(len(indices), index)])
+            scores = np.concatenate([best_scores, scores])
+            keep, best_scores = top_k_scores(scores, top_k)
+            best_ids, best_chunks = ids[keep], chunks[keep]
+
+        metadata = {index: {document["id"]: document
+                            for document in self.read_metadata(index)}
+                    for index in set(best_chunks.tolist())}
+        return [dict(metadata[index][doc_id], score=float(score))
+                for doc_id, index, score in zip(best_ids.tolist(),
+                                                best_chunks.tolist(),
+                                                best_scores)]
@@ -0,0 +1,259 @@
+"""
+Lightweight TF-IDF scoring in pure NumPy.
+
+A small re-implementation of what scoring needs from scikit-learn's
+``TfidfVectorizer`` with its default settings: lowercased ``\\b\\w\\w+\\b``
+tokens, raw term counts, smoothed IDF (``ln((1 + n) / (1 + df)) + 1``) and
+L2-normalised rows. Terms get ids through the hashing trick (a 64-bit
+BLAKE2 hash, so collisions are negligible), which means no vocabulary dict
+has to be built or loaded; the only state is an IDF table of sorted term
+ids and their weights.
+
+Documents are kept as ``(term positions, weights)`` pairs of NumPy arrays
+and compared with a sparse dot product, so scoring needs neither SciPy nor
+scikit-learn. The scores match ``TfidfVectorizer`` to floating-point
+precision; see ``benchmarks/scoring_backends.py``.
+"""
+import functools
+import hashlib
+import re
+from collections import Counter
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def term_id(term):
+    """
+    Hashes a term to a stable signed 64-bit id.
+
+    Args:
+        term (str): The term.
+
+    Returns:
+        int: The term id.
+    """
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def token_counts(text):
+    """
+    Counts the terms of a document the way ``TfidfVectorizer`` tokenises it.
+
+    Args:
+        text (str): The document.
+
+    Returns:
+        dict: Term id -> number of occurrences.
+    """
+    counts = Counter(TOKEN_PATTERN.findall(text.lower()))
+    return {term_id(term): count for term, count in counts.items()}
+
+
+class IdfTable:
+    """
+    IDF weights keyed by hashed term id.
+
+    Args:
+        term_ids (numpy.ndarray): The term ids, sorted ascending.
+        idf (numpy.ndarray): The IDF weight of each term.
+    """
+
+    def __init__(self, term_ids, idf):
+        self.term_ids = np.asarray(term_ids, dtype=np.int64)
+        self.idf = np.asarray(idf, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.term_ids)
+
+    @classmethod
+    def from_counts(cls, documents):
+        """
+        Fits IDF weights on a set of documents, like ``TfidfVectorizer.fit``.
+
+        Args:
+            documents (list): ``token_counts`` of each document.
+
+        Returns:
+            IdfTable: The fitted table.
+        """
+        ids = [np.fromiter(counts, dtype=np.int64, count=len(counts))
+               for counts in documents]
+        term_ids, df = np.unique(np.concatenate(ids), return_counts=True)
+        idf = np.log((1 + len(documents)) / (1 + df)) + 1
+        return cls(term_ids, idf)
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer):
+        """
+        Converts a fitted ``TfidfVectorizer`` such as the corpus model.
+
+        Args:
+            vectorizer (TfidfVectorizer): The fitted vectorizer.
+
+        Returns:
+            IdfTable: A table with the vectorizer's vocabulary and weights.
+        """
+        terms = vectorizer.get_feature_names_out()
+        ids = np.fromiter((term_id(str(term)) for term in terms),
+                          dtype=np.int64, count=len(terms))
+        order = np.argsort(ids, kind="stable")
+        return cls(ids[order], np.asarray(vectorizer.idf_)[order])
+
+    def save(self, path):
+        """
+        Saves the table as an ``.npz`` file.
+
+        Args:
+            path (str): Where to write the table.
+        """
+        np.savez(path, term_ids=self.term_ids, idf=self.idf)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a table written by ``save``.
+
+        Args:
+            path (str): The table file.
+
+        Returns:
+            IdfTable: The table.
+        """
+        with np.load(path) as arrays:
+            return cls(arrays["term_ids"], arrays["idf"])
+
+    def vector(self, counts):
+        """
+        Builds the L2-normalised TF-IDF vector of a document.
+
+        Terms missing from the table are dropped, as ``TfidfVectorizer``
+        drops terms outside its vocabulary.
+
+        Args:
+            counts (dict): ``token_counts`` of the document.
+
+        Returns:
+            tuple: ``(positions, weights)`` arrays, where ``positions`` are
+            sorted indices into the table.
+        """
+        if not len(self.term_ids):
+            return np.array([], dtype=np.intp), np.array([], dtype=np.float64)
+        ids = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+
+        positions = np.searchsorted(self.term_ids, ids)
+        positions[positions == len(self.term_ids)] = 0
+        known = self.term_ids[positions] == ids
+        positions, tf = positions[known], tf[known]
+
+        order = np.argsort(positions)
+        positions = positions[order]
+        weights = tf[order] * self.idf[positions]
+        norm = np.sqrt(weights @ weights)
+        if norm:
+            weights /= norm
+        return positions, weights
+
+
+def term_names(text, positions, table):
+    """
+    Names the terms at table positions.
+
+    Term ids are hashes, so the names are recovered from the text the
+    positions were vectorised from.
+
+    Args:
+        text (str): The document.
+        positions (numpy.ndarray): Positions from ``table.vector`` of the
+            document's counts.
+        table (IdfTable): The IDF table.
+
+    Returns:
+        dict: Position -> term.
+    """
+    names = {term_id(term): term for term in TOKEN_PATTERN.findall(text.lower())}
+    return {position: names[table.term_ids[position]]
+            for position in positions.tolist()}
+
+
+def unscored_terms(text, table):
+    """
+    Finds the terms of a document that an IDF table has no weight for.
+
+    Args:
+        text (str): The document.
+        table (IdfTable): The IDF table.
+
+    Returns:
+        dict: Term id -> term, for the document's terms outside the table.
+    """
+    names = {term_id(term): term for term in TOKEN_PATTERN.findall(text.lower())}
+    ids = np.fromiter(names, dtype=np.int64, count=len(names))
+    known = np.zeros(len(ids), dtype=bool)
+    if len(table.term_ids):
+        positions = np.searchsorted(table.term_ids, ids)
+        positions[positions == len(table.term_ids)] = 0
+        known = table.term_ids[positions] == ids
+    return {i: names[i] for i, is_known in zip(ids.tolist(), known.tolist())
+            if not is_known}
+
+
+def sparse_dot(a, b):
+    """
+    Dot product of two ``(positions, weights)`` vectors.
+
+    Args:
+        a (tuple): The first vector.
+        b (tuple): The second vector.
+
+    Returns:
+        float: The dot product; the cosine similarity for normalised vectors.
+    """
+    _, ia, ib = np.intersect1d(a[0], b[0], assume_unique=True,
+                               return_indices=True)
+    return float(a[1][ia] @ b[1][ib])
+
+
+def document_vectors(job_description, resumes, table=None):
+    """
+    Vectorises a job description and resumes with TF-IDF.
+
+    Args:
+        job_description (str): The job description.
+        resumes (list): The resume texts.
+        table (IdfTable, optional): Precomputed IDF weights. Without one,
+            they are fitted on the job description and resumes themselves.
+
+    Returns:
+        tuple: ``(query, vectors, table)``; the job description's vector, one
+        vector per resume and the IDF table used.
+    """
+    counts = [token_counts(text) for text in [job_description] + resumes]
+    if table is None:
+        table = IdfTable.from_counts(counts)
+    query, *vectors = [table.vector(c) for c in counts]
+    return query, vectors, table
+
+
+def cosine_scores(job_description, resumes, table=None):
+    """
+    Scores resumes against a job description with TF-IDF cosine similarity.
+
+    Args:
+        job_description (str): The job description.
+        resumes (list): The resume texts.
+        table (IdfTable, optional): Precomputed IDF weights. Without one,
+            they are fitted on the job description and resumes themselves.
+
+    Returns:
+        tuple: ``(scores, table)``; the cosine similarity of each resume and
+        the IDF table used.
+    """
+    query, vectors, table = document_vectors(job_description, resumes, table)
+    scores = np.fromiter((sparse_dot(query, v) for v in vectors),
+                         dtype=np.float64, count=len(vectors))
+    return scores, table
@@ -0,0 +1,326 @@
+"""
+Background extraction of uploaded resumes.
+
+Parsing a PDF inside the Streamlit script freezes that session's rerun and
+holds a server thread for the whole parse. Uploads are instead handed to a
+shared, bounded pool as soon as they arrive; the script checks the returned
+future on each rerun and picks the text up once it is ready.
+
+Extractions run in a bounded pool of long-lived worker processes, so a
+parse can really be stopped without paying for a new interpreter per
+document: documents over the size or page limit are rejected, and a worker
+whose parse runs past the timeout is terminated, instead of pinning a CPU,
+and replaced.
+Extracted text goes into the text cache and failures are remembered, so a
+resume is only ever parsed once however often the script reruns.
+
+Limits (environment variables):
+    RESUME_ANALYSER_MAX_UPLOAD_BYTES    largest accepted PDF (default 10 MiB)
+    RESUME_ANALYSER_MAX_PAGES           most pages accepted (default 50)
+    RESUME_ANALYSER_EXTRACTION_TIMEOUT  seconds per document (default 30)
+    RESUME_ANALYSER_UPLOAD_WORKERS      parallel extractions (default: up
+                                        to 4, one per CPU)
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from resume_analyser.metrics import stage
+from resume_analyser.pdf_cache import default_text_cache, read_file_bytes
+
+MAX_UPLOAD_BYTES = int(os.environ.get("RESUME_ANALYSER_MAX_UPLOAD_BYTES",
+                                      10 * 1024 * 1024))
+MAX_PAGES = int(os.environ.get("RESUME_ANALYSER_MAX_PAGES", 50))
+EXTRACTION_TIMEOUT = float(os.environ.get("RESUME_ANALYSER_EXTRACTION_TIMEOUT", 30))
+UPLOAD_WORKERS = int(os.environ.get("RESUME_ANALYSER_UPLOAD_WORKERS",
+                                    min(4, os.cpu_count() or 1)))
+
+# How many failed documents are remembered, so they are not retried
+FAILURE_MEMORY = 256
+
+
+class UploadRejected(ValueError):
+    """An upload that is over a limit, unreadable or too slow to parse."""
+
+
+def _read_pdf(data, max_pages):
+    """
+    Extracts a PDF; runs in a worker process.
+
+    Returns:
+        tuple: ``(status, payload, pages)`` where ``status`` is ``"ok"`` with
+        the text as payload, or ``"rejected"`` with the reason.
+    """
+    try:
+        from PyPDF2 import PdfReader
+
+        pdf = PdfReader(io.BytesIO(data))
+        pages = len(pdf.pages)
+        if pages > max_pages:
+            return ("rejected", f"the PDF has {pages} pages; the limit is "
+                    f"{max_pages}", pages)
+        return "ok", "".join(page.extract_text() for page in pdf.pages), pages
+    except Exception as error:  # reported to the parent
+        return ("rejected", f"the PDF could not be read "
+                f"({type(error).__name__}: {error})", None)
+
+
+def _serve_extractions(connection):
+    """Extracts the PDFs sent over a pipe until it is closed."""
+    # Imported once per worker rather than once per document
+    import PyPDF2  # noqa: F401
+
+    while True:
+        try:
+            data, max_pages = connection.recv()
+        except (EOFError, OSError):
+            return
+        connection.send(_read_pdf(data, max_pages))
+
+
+class ExtractionPool:
+    """
+    A bounded set of long-lived PDF extraction processes.
+
+    Workers are started on demand, up to ``size``, and reused. A worker
+    whose parse runs past its timeout, or that crashes, is terminated and
+    replaced by a fresh one on a later request.
+
+    Args:
+        size (int): Most extractions running at once; further callers wait
+            for a free worker.
+    """
+
+    def __init__(self, size=UPLOAD_WORKERS):
+        self.size = size
+        # Forking a threaded server is unsafe, so workers are spawned
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def _start_worker(self):
+        connection, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_serve_extractions, args=(child,), daemon=True,
+            name="resume-extraction")
+        process.start()
+        child.close()
+        return process, connection
+
+    @staticmethod
+    def _stop_worker(worker):
+        process, connection = worker
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        connection.close()
+
+    def start(self):
+        """Starts all the workers ahead of the first extraction."""
+        with self._lock:
+            while len(self._idle) < self.size:
+                self._idle.append(self._start_worker())
+
+    def extract(self, data, max_pages, timeout):
+        """
+        Extracts a PDF on a free worker.
+
+        Args:
+            data (bytes): The PDF.
+            max_pages (int): Documents with more pages are rejected.
+            timeout (float): Seconds before the worker is terminated.
+
+        Returns:
+            tuple: ``(status, payload, pages)``; see ``_read_pdf``.
+
+        Raises:
+            UploadRejected: If the parse times out or the worker crashes.
+        """
+        with self._slots:
+            with self._lock:
+                worker = self._idle.pop() if self._idle else None
+            if worker is None or not worker[0].is_alive():
+                if worker is not None:
+                    self._stop_worker(worker)
+                worker = self._start_worker()
+            try:
+                worker[1].send((data, max_pages))
+                if not worker[1].poll(timeout):
+                    self._stop_worker(worker)
+                    raise UploadRejected(
+                        f"reading the PDF took longer than {timeout:g} seconds")
+                result = worker[1].recv()
+            except (EOFError, OSError):
+                self._stop_worker(worker)
+                raise UploadRejected("the PDF parser crashed") from None
+            with self._lock:
+                self._idle.append(worker)
+            return result
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """
+    Returns the process-wide extraction pool.
+
+    Returns:
+        ExtractionPool: The shared pool of ``UPLOAD_WORKERS`` processes.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ExtractionPool()
+        return _default_pool
+
+
+def extract_with_limits(data, max_pages=MAX_PAGES, timeout=EXTRACTION_TIMEOUT,
+                        info=None, pool=None):
+    """
+    Extracts the text of a PDF in a worker process, within limits.
+
+    Args:
+        data (bytes): The PDF.
+        max_pages (int): Documents with more pages are rejected.
+        timeout (float): Seconds before the worker process is terminated.
+        info (dict, optional): Stage details to record the page count in.
+        pool (ExtractionPool, optional): The workers to use; defaults to
+            ``get_extraction_pool()``.
+
+    Returns:
+        str: The extracted text, as ``extract_text_from_pdf`` returns it.
+
+    Raises:
+        UploadRejected: If the document breaks a limit or cannot be read.
+    """
+    if pool is None:
+        pool = get_extraction_pool()
+    status, payload, pages = pool.extract(data, max_pages, timeout)
+
+    if info is not None:
+        info["pages"] = pages
+    if status != "ok":
+        raise UploadRejected(payload)
+    return payload
+
+
+class UploadExtractor:
+    """
+    Extracts uploaded PDFs on a shared, bounded pool.
+
+    Args:
+        workers (int): Extractions running at once; further uploads queue.
+        cache (TextCache, optional): Where extracted text is stored and
+            looked up.
+        max_bytes (int): Larger uploads are rejected without parsing.
+        max_pages (int): Documents with more pages are rejected.
+        timeout (float): Seconds allowed per document.
+    """
+
+    def __init__(self, workers=UPLOAD_WORKERS, cache=None,
+                 max_bytes=MAX_UPLOAD_BYTES, max_pages=MAX_PAGES,
+                 timeout=EXTRACTION_TIMEOUT):
+        self.cache = cache
+        self.processes = ExtractionPool(workers)
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers,
+                                        thread_name_prefix="resume-upload")
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._failures = OrderedDict()
+
+    def submit(self, file):
+        """
+        Starts extracting an upload, unless it is cached or already running.
+
+        Safe to call on every rerun: the same document always maps to the
+        same future until it finishes, and to its cached text or remembered
+        failure afterwards.
+
+        Args:
+            file (str or file-like): A path or an uploaded file object.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the text, or fails with
+            ``UploadRejected``.
+        """
+        data = read_file_bytes(file)
+        key = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            failure = self._failures.get(key)
+
+        future = Future()
+        if failure is not None:
+            future.set_exception(failure)
+            return future
+        if len(data) > self.max_bytes:
+            future.set_exception(UploadRejected(
+                f"the file is {len(data) / 1048576:.1f} MiB; the limit is "
+                f"{self.max_bytes / 1048576:.1f} MiB"))
+            return future
+
+        text = self.cache.get(key) if self.cache is not None else None
+        if text is not None:
+            with stage("extraction", cache_hit=True, text_length=len(text)):
+                future.set_result(text)
+            return future
+
+        with self._lock:
+            # Another session may have submitted the same document meanwhile
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pool.submit(self._extract, key, data)
+                self._pending[key] = future
+        return future
+
+    def _extract(self, key, data):
+        try:
+            with stage("extraction", cache_hit=False) as info:
+                text = extract_with_limits(data, self.max_pages, self.timeout,
+                                           info, self.processes)
+                info["text_length"] = len(text)
+            if self.cache is not None:
+                self.cache.put(key, text)
+            return text
+        except UploadRejected as error:
+            with self._lock:
+                self._failures[key] = error
+                while len(self._failures) > FAILURE_MEMORY:
+                    self._failures.popitem(last=False)
+            raise
+        finally:
+            # Submitted while holding the lock, so this runs after the
+            # future was registered
+            with self._lock:
+                self._pending.pop(key, None)
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_upload_extractor():
+    """
+    Returns the process-wide extractor, backed by the default text cache.
+
+    Returns:
+        UploadExtractor: The shared extractor.
+    """
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = UploadExtractor(cache=default_text_cache)
+        return _extractor
@@ -0,0 +1,203 @@
+"""
+Memory-mapped store of precomputed resume vectors.
+
+Resumes are extracted and vectorised once and their TF-IDF vectors kept on
+disk as the three arrays of a CSR matrix, one ``.npy`` file each, with a
+metadata table of resume ids, file names and content hashes. Opening the
+store maps the arrays with ``np.load(mmap_mode="r")`` and wraps them in a
+SciPy matrix without copying, so any number of scoring processes on the
+same machine share one copy of the vectors through the OS page cache, and
+only the pages a query touches are ever read.
+
+Layout of a store directory::
+
+    vectorizer.joblib       the fitted TF-IDF vectorizer
+    manifest.json           shape, array files and the metadata table
+    indptr-00000.npy        CSR row pointers
+    indices-00000.npy       CSR column indices (sorted within each row)
+    data-00000.npy          CSR values
+
+The arrays carry a generation number. A rewrite puts new arrays next to the
+old ones and then atomically replaces the manifest, so readers never see a
+half-written store; on POSIX systems, processes that still map the old
+arrays keep working until they reopen it.
+"""
+import json
+import os
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+
+from resume_analyser.engine import (
+    extract_text_from_pdf,
+    list_resume_files,
+    sparse_cosine_scores,
+    top_k_scores,
+    vectorize_documents,
+)
+from resume_analyser.pdf_cache import file_digest
+
+VECTORIZER_FILE = "vectorizer.joblib"
+MANIFEST_FILE = "manifest.json"
+ARRAYS = ("indptr", "indices", "data")
+
+
+def _read_manifest(path):
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_vector_store(path, vectors, metadata, vectorizer=None):
+    """
+    Writes vectors and their metadata as a store, replacing any existing one.
+
+    Args:
+        path (str): The store directory, created if missing.
+        vectors (scipy.sparse matrix): One TF-IDF row per resume.
+        metadata (list): One dict per row, e.g. ``file_name`` and ``digest``.
+        vectorizer (TfidfVectorizer, optional): The vectorizer the rows were
+            produced with, saved for transforming queries.
+    """
+    if vectors.shape[0] != len(metadata):
+        raise ValueError("Expected one metadata entry per vector")
+    os.makedirs(path, exist_ok=True)
+    if vectorizer is not None:
+        joblib.dump(vectorizer, os.path.join(path, VECTORIZER_FILE))
+
+    # Canonical CSR, so readers never need to sort or merge the read-only
+    # mapped arrays
+    vectors = sp.csr_matrix(vectors)
+    vectors.sum_duplicates()
+    vectors.sort_indices()
+
+    previous = _read_manifest(path)
+    generation = previous["generation"] + 1 if previous else 0
+    files = {}
+    for name in ARRAYS:
+        files[name] = f"{name}-{generation:05d}.npy"
+        np.save(os.path.join(path, files[name]), getattr(vectors, name))
+
+    manifest = {
+        "generation": generation,
+        "shape": list(vectors.shape),
+        "files": files,
+        "documents": [dict(meta, id=i) for i, meta in enumerate(metadata)],
+    }
+    tmp_path = os.path.join(path, MANIFEST_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle)
+    os.replace(tmp_path, os.path.join(path, MANIFEST_FILE))
+
+    if previous:
+        for name in previous["files"].values():
+            os.remove(os.path.join(path, name))
+
+
+def build_vector_store(path, resumes, model=None, cache=None):
+    """
+    Extracts and vectorises PDF resumes and writes them as a store.
+
+    Args:
+        path (str): The store directory.
+        resumes (str or list): A directory of PDF resumes, or a list of
+            paths or uploaded file objects.
+        model (TfidfVectorizer, optional): The corpus model to vectorise
+            with. Without one, a vectorizer is fitted on the resumes.
+        cache (TextCache, optional): Cache for the extracted text.
+
+    Returns:
+        VectorStore: The opened store.
+    """
+    if isinstance(resumes, (str, os.PathLike)):
+        resumes = list_resume_files(resumes)
+
+    texts, metadata = [], []
+    for file in resumes:
+        texts.append(extract_text_from_pdf(file, cache))
+        name = getattr(file, "name", file)
+        metadata.append({"file_name": os.path.basename(str(name)),
+                         "digest": file_digest(file)})
+
+    vectorizer, vectors = vectorize_documents(texts, model)
+    write_vector_store(path, vectors, metadata, vectorizer)
+    return VectorStore(path)
+
+
+class VectorStore:
+    """
+    A read-only, memory-mapped view of a vector store.
+
+    Args:
+        path (str): The store directory written by ``write_vector_store``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        manifest = _read_manifest(path)
+        if manifest is None:
+            raise FileNotFoundError(f"No vector store at {path}")
+        self.documents = manifest["documents"]
+        self._ids_by_digest = {document.get("digest"): document["id"]
+                               for document in self.documents}
+
+        arrays = {name: np.load(os.path.join(path, manifest["files"][name]),
+                                mmap_mode="r")
+                  for name in ARRAYS}
+        self.vectors = sp.csr_matrix(
+            (arrays["data"], arrays["indices"], arrays["indptr"]),
+            shape=tuple(manifest["shape"]), copy=False)
+
+        vectorizer_path = os.path.join(path, VECTORIZER_FILE)
+        self.vectorizer = (joblib.load(vectorizer_path)
+                           if os.path.exists(vectorizer_path) else None)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def lookup(self, digest):
+        """
+        Finds a stored resume by the SHA-256 of its PDF.
+
+        Args:
+            digest (str): The content hash (see ``pdf_cache.file_digest``).
+
+        Returns:
+            int: The resume's row, or None if it is not stored.
+        """
+        return self._ids_by_digest.get(digest)
+
+    def scores(self, query_vector):
+        """
+        Cosine similarity of every stored resume to a query vector.
+
+        Args:
+            query_vector (scipy.sparse matrix): A 1 x V TF-IDF row from the
+                store's vectorizer.
+
+        Returns:
+            numpy.ndarray: One score per stored resume.
+        """
+        return sparse_cosine_scores(query_vector, self.vectors)
+
+    def search(self, job_description, top_k=10):
+        """
+        Finds the stored resumes most similar to a job description.
+
+        Args:
+            job_description (str): The job description.
+            top_k (int): Number of results to return.
+
+        Returns:
+            list: Document metadata dicts with a ``score`` key, best first.
+        """
+        if self.vectorizer is None:
+            raise RuntimeError("The store has no vectorizer to transform "
+                               "the job description with")
+        _, query = vectorize_documents([job_description], self.vectorizer)
+        best, best_scores = top_k_scores(self.scores(query), top_k)
+        return [dict(self.documents[i], score=float(score))
+                for i, score in zip(best, best_scores)]
@@ -0,0 +1,74 @@
+"""
+Deferred loading of the heavy dependencies.
+
+NumPy, SciPy, scikit-learn and PyPDF2 take well over a second to import, and
+none of them is needed to render the app's landing page. The package imports
+them on first use instead, and ``prewarm`` can load them (and the corpus
+model) in a background thread once the page is up, so the first upload does
+not pay for the imports either.
+
+Set ``RESUME_ANALYSER_PREWARM=0`` to turn the background prewarm off.
+"""
+import importlib
+import logging
+import os
+import threading
+import time
+
+from resume_analyser.backends import get_backend
+
+# Imported by PDF extraction; the scoring backend adds its own modules
+HEAVY_MODULES = ("PyPDF2",)
+
+PREWARM_ENABLED = os.environ.get(
+    "RESUME_ANALYSER_PREWARM", "1").lower() not in ("0", "false", "no", "")
+
+logger = logging.getLogger(__name__)
+
+_thread = None
+_thread_lock = threading.Lock()
+
+
+def _load(load_model):
+    start = time.perf_counter()
+    try:
+        backend = get_backend()
+        for name in backend.modules + HEAVY_MODULES:
+            importlib.import_module(name)
+        if load_model:
+            backend.load_model()
+    except Exception:
+        # Prewarming is best effort; the real call will raise the error
+        logger.exception("Prewarm failed")
+        return
+    logger.info("Prewarm finished in %.2f s", time.perf_counter() - start)
+
+
+def prewarm(load_model=True, background=True):
+    """
+    Imports the heavy dependencies ahead of their first use.
+
+    Only the modules of the configured scoring backend are loaded, so a
+    ``numpy`` backend worker never imports scikit-learn.
+
+    Args:
+        load_model (bool): Also load the default corpus model.
+        background (bool): Run in a daemon thread and return at once. Only
+            one background prewarm is started per process.
+
+    Returns:
+        threading.Thread: The prewarm thread, or None when it ran in the
+        foreground.
+    """
+    if not background:
+        _load(load_model)
+        return None
+
+    global _thread
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_load, args=(load_model,),
+                                       name="resume-analyser-prewarm",
+                                       daemon=True)
+            _thread.start()
+        return _thread